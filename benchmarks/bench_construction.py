@@ -0,0 +1,59 @@
+"""
+Compare instance cloning used by VarGroup.__init__ against the former deepcopy path.
+
+Usage: python -m benchmarks.bench_construction [groups] [vars_per_group]
+"""
+import sys
+import timeit
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List, Type
+
+from envium import EnvGroup, Environ, env_var
+
+
+def make_environ(groups: int, vars_per_group: int) -> Type[Environ]:
+    namespace: Dict[str, Any] = {"__annotations__": {}}
+
+    for g in range(groups):
+        group_namespace: Dict[str, Any] = {"__annotations__": {}}
+        for v in range(vars_per_group):
+            name = f"var_{v}"
+            if v % 3 == 0:
+                group_namespace["__annotations__"][name] = List[str]
+                group_namespace[name] = env_var(default_factory=lambda: ["a", "b"])
+            elif v % 3 == 1:
+                group_namespace["__annotations__"][name] = Path
+                group_namespace[name] = env_var(Path("/tmp") / name)
+            else:
+                group_namespace["__annotations__"][name] = str
+                group_namespace[name] = env_var(name)
+
+        group_cls = type(f"Group{g}", (EnvGroup,), group_namespace)
+        namespace[f"group_{g}"] = group_cls()
+
+    return type("BenchEnviron", (Environ,), namespace)
+
+
+def main() -> None:
+    groups = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    vars_per_group = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    number = 20
+
+    environ_cls = make_environ(groups, vars_per_group)
+    prototypes = [s.prototype for s in environ_cls._schema.values()]
+
+    deepcopy_time = timeit.timeit(
+        lambda: [deepcopy(p) for p in prototypes], number=number
+    )
+    clone_time = timeit.timeit(lambda: [p._clone() for p in prototypes], number=number)
+    construct_time = timeit.timeit(lambda: environ_cls(name="bench"), number=number)
+
+    print(f"{groups} groups x {vars_per_group} vars, {number} rounds")
+    print(f"deepcopy:      {deepcopy_time / number * 1000:.3f} ms")
+    print(f"clone:         {clone_time / number * 1000:.3f} ms")
+    print(f"construction:  {construct_time / number * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
+from envium.cache import *
 from envium.ctx import *
 from envium.environ import *
 from envium.exceptions import *
+from envium.exporters import *
+from envium.frozen import *
+from envium.observers import *
+from envium.providers import *
 from envium.secrets import *
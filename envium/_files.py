@@ -0,0 +1,71 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+__all__ = ["write_atomic"]
+
+
+def write_atomic(path: Path, content: bytes, mode: Optional[int] = None) -> bool:
+    """
+    Replace file content through a temporary file, skip writing if content is the same.
+
+    :param mode: Permissions of the file, kept from the existing file by default
+    :return: False if the file already had the same content and was left untouched
+    """
+    # Symlinks are kept, the file they point to is replaced
+    path = path.resolve()
+    if _file_digest(path) == hashlib.sha256(content).digest():
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if mode is None:
+        mode = _file_mode(path)
+    fd, tmp_path = _create_temp_file(path, 0o666 if mode is None else mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        if mode is not None:
+            # Created mode is restricted by umask, given or existing mode is kept exactly
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return True
+
+
+def _create_temp_file(path: Path, mode: int) -> Tuple[int, str]:
+    """
+    Create temporary file next to path, umask applies to its mode like to any new file.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = str(path.with_name(f".{path.name}.{os.urandom(6).hex()}"))
+        try:
+            return os.open(tmp_path, flags, mode), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _file_mode(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        return None
+
+
+def _file_digest(path: Path) -> Optional[bytes]:
+    try:
+        f = path.open("rb")
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    digest = hashlib.sha256()
+    with f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.digest()
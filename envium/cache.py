@@ -0,0 +1,217 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Set, Tuple, Union
+
+from envium._files import write_atomic
+from envium.exceptions import EnviumError
+from envium.providers import SecretProvider
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None  # type: ignore
+
+__all__ = ["SecretCache", "EncryptedFileStore", "CacheStats"]
+
+_NO_CRYPTOGRAPHY = (
+    'Encrypted store requires "cryptography" package, install "envium[encryption]"'
+)
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    # Expired entries that were returned while being refreshed in the background
+    stale_hits: int
+    misses: int
+    evictions: int
+    refreshes: int
+    refresh_errors: int
+
+
+class EncryptedFileStore:
+    """
+    Cache entries persisted in a file encrypted with Fernet, requires "cryptography" package.
+    """
+
+    def __init__(self, path: Union[Path, str], key: bytes) -> None:
+        """
+        :param key: Fernet key, e.g. from EncryptedFileStore.generate_key()
+        """
+        if Fernet is None:
+            raise EnviumError(_NO_CRYPTOGRAPHY)
+
+        self.path = Path(path)
+        self._fernet = Fernet(key)
+
+    @staticmethod
+    def generate_key() -> bytes:
+        if Fernet is None:
+            raise EnviumError(_NO_CRYPTOGRAPHY)
+        key: bytes = Fernet.generate_key()
+        return key
+
+    def load(self) -> Dict[str, Tuple[str, float]]:
+        """
+        Return name -> (value, expiration time), empty if the file is missing or can't be decrypted.
+        """
+        try:
+            token = self.path.read_bytes()
+            entries = json.loads(self._fernet.decrypt(token))
+        except (FileNotFoundError, InvalidToken, ValueError):
+            return {}
+
+        return {k: (v, expires) for k, (v, expires) in entries.items()}
+
+    def save(self, entries: Dict[str, Tuple[str, float]]) -> None:
+        content = self._fernet.encrypt(json.dumps(entries).encode("utf-8"))
+        # Entries can be read only by the owner even though they are encrypted
+        write_atomic(self.path, content, mode=0o600)
+
+
+class SecretCache:
+    """
+    LRU cache of raw secret values keyed by secret full name, entries expire after ttl seconds.
+
+    Until one more ttl passes, expired secrets of providers are still returned while they
+    are refreshed in the background. One cache is meant to be shared by many Secrets.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_size: int = 1024,
+        store: Optional[EncryptedFileStore] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param clock: Current time in seconds, wall clock so expiration times in the store
+            stay valid across processes
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._store = store
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Name -> (value, expiration time), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._dirty = False
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+        if store:
+            now = self._clock()
+            entries = sorted(store.load().items(), key=lambda i: i[1][1])
+            self._entries.update((k, e) for k, e in entries if e[1] > now - ttl)
+            self._evict()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            stale_hits=self._stale_hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            refreshes=self._refreshes,
+            refresh_errors=self._refresh_errors,
+        )
+
+    def get(self, name: str, allow_stale: bool = False) -> Optional[str]:
+        """
+        Return cached value, None if it's missing or expired and stale values are not allowed.
+        """
+        return self._lookup(name, allow_stale)[0]
+
+    def _lookup(self, name: str, allow_stale: bool) -> Tuple[Optional[str], bool]:
+        """
+        Return cached value and whether it's stale.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self._misses += 1
+                return None, False
+
+            value, expires = entry
+            now = self._clock()
+            if expires > now:
+                self._hits += 1
+                stale = False
+            elif allow_stale and expires + self.ttl > now:
+                self._stale_hits += 1
+                stale = True
+            else:
+                self._misses += 1
+                return None, False
+
+            self._entries.move_to_end(name)
+            return value, stale
+
+    def set(self, name: str, value: str) -> None:
+        with self._lock:
+            self._entries[name] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(name)
+            self._dirty = True
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def refresh(self, provider: SecretProvider, keys: Dict[str, str]) -> None:
+        """
+        Fetch secrets from provider in a background thread and update their entries.
+
+        :param keys: Secret full name -> provider key
+        """
+        with self._lock:
+            keys = {n: k for n, k in keys.items() if n not in self._refreshing}
+            self._refreshing.update(keys)
+
+        if not keys:
+            return
+
+        def run() -> None:
+            try:
+                values = provider.fetch(list(set(keys.values())))
+                for name, key in keys.items():
+                    if key in values:
+                        self.set(name, values[key])
+                self.flush()
+                failed = False
+            except Exception:
+                failed = True
+
+            with self._lock:
+                self._refreshing.difference_update(keys)
+                if failed:
+                    self._refresh_errors += 1
+                else:
+                    self._refreshes += 1
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def flush(self) -> None:
+        """
+        Save entries to the store if any of them changed.
+        """
+        with self._lock:
+            if not self._store or not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        self._store.save(entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
@@ -1,4 +1,12 @@
-from typing import TYPE_CHECKING, Any, Callable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    List,
+    Optional,
+    cast,
+)
 
 from envium.exceptions import EnviumError
 
@@ -16,9 +24,12 @@ class CtxVar(Var):
 
 class ComputedCtxVar(ComputedMixin, CtxVar):
     def __init__(
-        self, fget: Optional[Callable] = None, fset: Optional[Callable] = None
+        self,
+        fget: Optional[Callable] = None,
+        fset: Optional[Callable] = None,
+        cache: bool = False,
     ) -> None:
-        ComputedMixin.__init__(self, fget=fget, fset=fset)
+        ComputedMixin.__init__(self, fget=fget, fset=fset, cache=cache)
         CtxVar.__init__(self)
 
     pass
@@ -38,6 +49,15 @@ class Ctx(CtxGroup):
     def validate(self) -> None:
         self._validate()
 
+    def override(self, **values: Any) -> ContextManager["Ctx"]:
+        """
+        Override values of vars for the current asyncio task or thread only.
+
+        Nested vars are given by dotted paths, e.g. ctx.override(**{"db.name": "test"}).
+        Override values are type checked, other vars keep reading the shared values.
+        """
+        return cast(ContextManager["Ctx"], self._override(values))
+
     @property
     def errors(self) -> List[EnviumError]:
         return self._errors
@@ -53,8 +73,9 @@ def ctx_var(
 def computed_ctx_var(
     fget: Optional[Callable] = None,
     fset: Optional[Callable] = None,
+    cache: bool = False,
 ) -> Any:
-    return ComputedCtxVar(fget, fset)
+    return ComputedCtxVar(fget, fset, cache=cache)
 
 
 Group = VarGroup
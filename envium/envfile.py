@@ -0,0 +1,107 @@
+import mmap
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+from envium.exceptions import EnvFileError
+
+__all__ = ["iter_env_file"]
+
+# Files bigger than that are memory mapped instead of read at once
+MMAP_THRESHOLD = 1024 * 1024
+
+_Buffer = Union[bytes, mmap.mmap]
+
+
+def _find_closing_quote(buf: _Buffer, quote: bytes, pos: int) -> int:
+    """
+    Return position of the quote closing a value started before pos.
+
+    Values written by Environ.dump are not escaped, so a quote closes the value
+    only when nothing but whitespace follows it on the same line.
+    """
+    size = len(buf)
+    while True:
+        end = buf.find(quote, pos)
+        if end == -1:
+            return -1
+
+        line_end = buf.find(b"\n", end)
+        if line_end == -1:
+            line_end = size
+
+        if not buf[end + 1 : line_end].strip():
+            return end
+
+        pos = end + 1
+
+
+def _iter_buffer(buf: _Buffer, path: Path) -> Iterator[Tuple[str, str]]:
+    size = len(buf)
+    pos = 0
+    line = 1
+
+    while pos < size:
+        line_end = buf.find(b"\n", pos)
+        if line_end == -1:
+            line_end = size
+
+        stripped = buf[pos:line_end].strip()
+        if not stripped or stripped.startswith(b"#"):
+            pos = line_end + 1
+            line += 1
+            continue
+
+        eq = buf.find(b"=", pos, line_end)
+        if eq == -1:
+            raise EnvFileError(path, line, 'Expected "KEY=value"')
+
+        key = buf[pos:eq].strip()
+        if key.startswith(b"export "):
+            key = key[len(b"export ") :].strip()
+
+        value_start = eq + 1
+        while value_start < line_end and buf[value_start : value_start + 1] in (
+            b" ",
+            b"\t",
+        ):
+            value_start += 1
+
+        quote = buf[value_start : value_start + 1]
+        if quote in (b'"', b"'"):
+            value_end = _find_closing_quote(buf, quote, value_start + 1)
+            if value_end == -1:
+                raise EnvFileError(
+                    path, line, f'Unterminated value of "{key.decode()}"'
+                )
+
+            value = buf[value_start + 1 : value_end]
+            line_end = buf.find(b"\n", value_end)
+            if line_end == -1:
+                line_end = size
+        else:
+            value = buf[value_start:line_end].strip()
+
+        yield key.decode("utf-8"), value.decode("utf-8")
+
+        line += value.count(b"\n") + 1
+        pos = line_end + 1
+
+
+def iter_env_file(path: Union[Path, str]) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (key, value) pairs of an env file in the format written by Environ.dump.
+
+    Handles blank lines, comments, "export" prefixes, and unquoted, single and double
+    quoted values. Quoted values can span multiple lines.
+    """
+    path = Path(path)
+
+    with path.open("rb") as f:
+        size = path.stat().st_size
+
+        if size < MMAP_THRESHOLD:
+            yield from _iter_buffer(f.read(), path)
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield from _iter_buffer(buf, path)
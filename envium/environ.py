@@ -1,21 +1,86 @@
+import hashlib
+import json
 import os
+import sys
+from collections import ChainMap
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
-
-from envium import comp
-from envium.exceptions import EnviumError, RedefinedVarError
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    IO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+from envium._files import write_atomic
+from envium.envfile import iter_env_file
+from envium.exporters import get_exporter
+from envium.parsers import format_value
+from envium.exceptions import (
+    ComputedVarError,
+    EnviumError,
+    ParseError,
+    RedefinedVarError,
+    UndefinedVarError,
+    ValidationErrors,
+)
 
 if TYPE_CHECKING:
     pass
 
-from envium.vars import ComputedMixin, FinalVar, Var, VarGroup, VarType
-
-__all__ = ["env_var", "Environ", "computed_env_var", "EnvGroup"]
+from envium.vars import (
+    _PENDING,
+    BaseVar,
+    ComputedMixin,
+    FinalVar,
+    Var,
+    VarGroup,
+    VarType,
+    _evaluating,
+)
+
+__all__ = [
+    "env_var",
+    "Environ",
+    "computed_env_var",
+    "EnvGroup",
+    "EnvironLayer",
+    "LoadReport",
+]
+
+# Bumped whenever the snapshot content changes
+_SNAPSHOT_VERSION = 2
+# Values of these types are stored in snapshots as they are, other ones are parsed again
+_SNAPSHOT_TYPES = (str, int, float, bool)
+
+
+class LoadReport(NamedTuple):
+    # Env names of vars that got their values from the source
+    loaded: List[str]
+    # Env names of vars that are not present in the source
+    missing: List[str]
+    # Source keys with the environ prefix that don't belong to any var
+    unknown: List[str]
 
 
 class EnvVar(Var):
     raw: Union[bool, str]
+    _root: "Environ"
     _parent: "EnvGroup"
+    # Computed when the var is bound to the tree
+    _env_name: str
+    # String the current value was loaded from
+    _raw_value: Optional[str]
 
     def __init__(
         self,
@@ -26,17 +91,37 @@ class EnvVar(Var):
     ) -> None:
         super().__init__(default=default, default_factory=default_factory)
         self._raw = raw
+        self._env_name = ""
+        self._raw_value = None
+
+    def _bind(self, name: str, parent: "VarGroup") -> None:
+        super()._bind(name, parent)
+        self._env_name = sys.intern(self._compute_env_name())
 
     def _init_value(self) -> None:
-        if self._parent._load:
-            env_value = os.environ.get(self._get_env_name(), None)
-            env_value = None if env_value == "None" else env_value
-            self._value = self._from_str(env_value) if env_value else None
+        if self._value is None:
+            self._value = self._get_default()
+
+    def _load_str(self, env_value: Optional[str]) -> None:
+        self._set_str(env_value)
+        self._changed()
+
+    def _set_str(self, env_value: Optional[str]) -> None:
+        self._raw_value = env_value
+        env_value = None if env_value == "None" else env_value
+        self._value = self._from_str(env_value) if env_value else None
 
         if self._value is None:
-            self._value = self._default
+            self._value = self._get_default()
+
+    def _resolve_pending(self) -> None:
+        # Value was loaded already, it's only parsed now, so it's not a change
+        self._set_str(self._root._lazy_source.get(self._env_name))
 
     def _get_env_name(self) -> str:
+        return self._env_name
+
+    def _compute_env_name(self) -> str:
         if self._raw:
             if self._raw is True:
                 ret = self._name
@@ -57,14 +142,16 @@ class ComputedEnvVar(ComputedMixin, EnvVar):
         fset: Optional[Callable] = None,
         *,
         raw: Union[bool, str] = None,
+        cache: bool = False,
     ) -> None:
-        ComputedMixin.__init__(self, fget=fget, fset=fset)
+        ComputedMixin.__init__(self, fget=fget, fset=fset, cache=cache)
         EnvVar.__init__(self, raw=raw)
     pass
 
 
 class EnvGroup(VarGroup[EnvVar]):
     raw: Union[bool, str]
+    _root: "Environ"
     _load: bool
 
     def __init__(
@@ -74,54 +161,449 @@ class EnvGroup(VarGroup[EnvVar]):
         self._load = load
         self._raw = raw
 
-    @property
-    def _fullname(self) -> str:
+    def _compute_fullname(self) -> str:
         if self._raw:
             if self._raw is True:
                 return self._name
             else:
                 return self._raw
 
-        ret = super()._fullname
+        ret = super()._compute_fullname()
         return ret
 
-    def _dump(self, path: Union[Path, str]) -> None:
-        path = Path(path)
-
-        if not path.parent.exists():
-            path.parent.mkdir(parents=True)
+    def _dump(self, path: Union[Path, str]) -> bool:
+        return write_atomic(Path(path), _format_env_file(self._root._get_env_vars()))
 
-        path.touch(exist_ok=True)
 
-        content = "\n".join(
-            [f'{key}="{value}"' for key, value in self._root._get_env_vars().items()]
-        )
-        path.write_text(content, "utf-8")
+def _format_env_file(env_vars: Dict[str, str]) -> bytes:
+    content = "\n".join([f'{key}="{value}"' for key, value in env_vars.items()])
+    return content.encode("utf-8")
 
 
 class Environ(EnvGroup):
-    def __init__(self, name: str, raw: Union[bool, str] = False, load: bool = False):
+    # Env name -> first var using it, rebuilt whenever the flat index changes
+    _env_index: Dict[str, EnvVar]
+    _env_index_flat: Optional[List[EnvVar]]
+    # Vars whose env name is already taken by another var
+    _redefined: Set[EnvVar]
+    # Computed vars that are evaluated on every read
+    _volatile: Set[EnvVar]
+    _load_report: Optional[LoadReport]
+    # Source of lazily loaded vars
+    _lazy_source: Optional[Mapping[str, str]]
+
+    def __init__(
+        self,
+        name: str,
+        raw: Union[bool, str] = False,
+        load: bool = False,
+        *,
+        source: Optional[Mapping[str, str]] = None,
+        lazy: bool = False,
+        snapshot: Optional[Union[Path, str]] = None,
+    ):
+        """
+        :param source: Mapping of environmental variables to load from, os.environ by default
+        :param lazy: Parse values on first access instead of during construction
+        :param snapshot: Path of a JSON file caching values loaded from the same environment,
+            constructions with unchanged schema and environment skip validation and parsing
+            of str, int, float and bool vars. Can't be combined with lazy loading.
+        """
         if not name:
             raise EnviumError("Root needs to have a name")
 
+        if lazy and snapshot is not None:
+            raise EnviumError("Lazy loading can't be combined with a snapshot")
+
+        self._env_index = {}
+        self._env_index_flat = None
+        self._redefined = set()
+        self._volatile = set()
+        self._load_report = None
+        self._lazy_source = None
+
+        load = load or source is not None or snapshot is not None
         super().__init__(name=name, load=load, raw=raw)
         self._root = self
         self._process()
 
-        if self._load:
+        if not self._load:
+            # Nested groups opted in to loading by default, only the root opted out
+            self._load_nested()
+            return
+
+        if lazy:
+            self._load_lazily(source)
+        elif snapshot is None:
+            # Vars can shadow public methods, so internal calls use private ones
+            with self._batch():
+                self._load_source(source)
             self._validate()
+        else:
+            self._load_with_snapshot(Path(snapshot), source)
+
+    def load(self, source: Optional[Mapping[str, str]] = None) -> LoadReport:
+        """
+        Load values of all vars from source in one pass.
+
+        :param source: Mapping of environmental variables, snapshot of os.environ by default
+        """
+        with self._batch():
+            return self._load_source(source)
+
+    def _load_source(self, source: Optional[Mapping[str, str]]) -> LoadReport:
+        if source is None:
+            source = dict(os.environ)
+
+        # Builds the set of redefined vars
+        self._get_env_index()
+        loaded = []
+        missing = []
+
+        for var in self._iter_loadable():
+            env_name = var._get_env_name()
+            env_value = source.get(env_name)
+            redefined = var in self._redefined
+
+            if env_value is None:
+                if not redefined:
+                    missing.append(env_name)
+                continue
+
+            var._load_str(env_value)
+            if not redefined:
+                loaded.append(env_name)
+
+        unknown = self._get_unknown(source)
+
+        self._load_report = LoadReport(loaded=loaded, missing=missing, unknown=unknown)
+        return self._load_report
+
+    def _load_nested(self) -> None:
+        """
+        Load vars of nested groups from os.environ, skipping vars of the root itself.
+        """
+        for var in self._iter_loadable():
+            if var._parent is self:
+                continue
+
+            env_value = os.environ.get(var._get_env_name())
+            if env_value is not None:
+                var._load_str(env_value)
+
+    def _get_unknown(self, source: Mapping[str, str]) -> List[str]:
+        env_index = self._get_env_index()
+        prefix = f"{self._get_env_prefix()}_"
+        return [k for k in source if k.startswith(prefix) and k not in env_index]
+
+    def _load_with_snapshot(
+        self, path: Path, source: Optional[Mapping[str, str]]
+    ) -> None:
+        """
+        Restore loaded values from snapshot file, or load, validate and save them there.
+        """
+        if source is None:
+            source = dict(os.environ)
+
+        fingerprint = self._get_fingerprint(source)
+        if self._restore_snapshot(path, fingerprint, source):
+            return
+
+        with self._batch():
+            self._load_source(source)
+        self._validate()
+        self._save_snapshot(path, fingerprint)
+
+    def _get_fingerprint(self, source: Mapping[str, str]) -> bytes:
+        """
+        Digest of the schema and of the source values it reads.
+        """
+        cls = self.__class__
+        digest = hashlib.sha256()
+        header = (_SNAPSHOT_VERSION, cls.__module__, cls.__qualname__, self._fullname)
+        digest.update(repr(header).encode("utf-8"))
+
+        for v in self._flat:
+            env_name = v._get_env_name()
+            env_value = source.get(env_name) if self._is_loadable(v) else None
+            entry = (
+                v._fullname,
+                env_name,
+                repr(v._type_),
+                v._optional,
+                # Reprs of objects can contain their address, which differs every run
+                format_value(v._default),
+                env_value,
+            )
+            digest.update(repr(entry).encode("utf-8"))
+
+        return digest.digest()
+
+    def _restore_snapshot(
+        self, path: Path, fingerprint: bytes, source: Mapping[str, str]
+    ) -> bool:
+        try:
+            # Values of snapshots written by someone else are not trusted
+            if hasattr(os, "getuid") and path.stat().st_uid != os.getuid():
+                return False
+            content = json.loads(path.read_bytes())
+            if content["fingerprint"] != fingerprint.hex():
+                return False
+            values = content["values"]
+            loaded = content["loaded"]
+            missing = content["missing"]
+        except Exception:
+            return False
+
+        for var in self._iter_loadable():
+            entry = values.get(var._fullname)
+            if entry is None:
+                continue
+
+            if len(entry) == 2:
+                var._raw_value, var._value = entry
+            else:
+                var._load_str(entry[0])
+
+        unknown = self._get_unknown(source)
+        self._load_report = LoadReport(loaded=loaded, missing=missing, unknown=unknown)
+        return True
+
+    def _save_snapshot(self, path: Path, fingerprint: bytes) -> None:
+        # Raw value and value of simple types, only raw value of the rest
+        values: Dict[str, List[Any]] = {}
+        for v in self._iter_loadable():
+            if v._raw_value is None:
+                continue
+            if type(v._value) in _SNAPSHOT_TYPES:
+                values[v._fullname] = [v._raw_value, v._value]
+            else:
+                values[v._fullname] = [v._raw_value]
+
+        report = self._load_report
+        content = {
+            "fingerprint": fingerprint.hex(),
+            "values": values,
+            "loaded": report.loaded,
+            "missing": report.missing,
+        }
+
+        try:
+            # Raw values can be secrets, so the file is readable only by the owner
+            write_atomic(path, json.dumps(content).encode("utf-8"), mode=0o600)
+        except OSError:
+            # Snapshot is only a cache, values are loaded again next time
+            pass
+
+    def load_file(self, path: Union[Path, str]) -> LoadReport:
+        """
+        Load values from an env file, e.g. one written by dump(), streaming it in one pass.
+
+        Unknown keys in the report are all file keys that don't belong to any var.
+        """
+        with self._batch():
+            return self._load_file(path)
+
+    def _load_file(self, path: Union[Path, str]) -> LoadReport:
+        env_index = self._get_env_index()
+        redefined: Dict[str, List[EnvVar]] = {}
+        for var in self._redefined:
+            redefined.setdefault(var._get_env_name(), []).append(var)
+
+        loaded = []
+        unknown = []
+        for key, env_value in iter_env_file(path):
+            var = env_index.get(key)
+            if var is None:
+                unknown.append(key)
+                continue
+
+            if not self._is_loadable(var):
+                continue
+
+            var._load_str(env_value)
+            loaded.append(key)
+
+            for v in redefined.get(key, []):
+                if self._is_loadable(v):
+                    v._load_str(env_value)
+
+        loaded_set = set(loaded)
+        missing = [
+            v._get_env_name()
+            for v in self._iter_loadable()
+            if v._get_env_name() not in loaded_set and v not in self._redefined
+        ]
+
+        self._load_report = LoadReport(loaded=loaded, missing=missing, unknown=unknown)
+        return self._load_report
+
+    def _load_lazily(self, source: Optional[Mapping[str, str]]) -> None:
+        """
+        Mark loadable vars so they are parsed from source on first access.
+        Live os.environ is used when source is not given.
+        """
+        self._lazy_source = os.environ if source is None else source
+
+        for var in self._iter_loadable():
+            var._value = _PENDING
+
+    def reload(
+        self, source: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Re-parse vars whose raw value in source differs from the one they were loaded from.
+
+        Only changed vars are validated, all changes are reverted if any of them is invalid.
+
+        :param source: Mapping of environmental variables, snapshot of os.environ by default
+        :return: Env name -> (old value, new value) of changed vars
+        """
+        with self._batch():
+            return self._reload(source)
+
+    def _reload(
+        self, source: Optional[Mapping[str, str]]
+    ) -> Dict[str, Tuple[Any, Any]]:
+        if source is None:
+            source = dict(os.environ)
+
+        lazy_source = self._lazy_source
+        if lazy_source is not None:
+            self._lazy_source = source
+
+        changed: List[Tuple[EnvVar, Any, Optional[str]]] = []
+        unparsed: Set[EnvVar] = set()
+        errors: List[EnviumError] = []
+        for var in self._iter_loadable():
+            # Pending vars will be read from the new source on first access
+            if var._value is _PENDING:
+                continue
+
+            env_value = source.get(var._get_env_name())
+            if env_value == var._raw_value:
+                continue
+
+            changed.append((var, var._value, var._raw_value))
+            try:
+                var._load_str(env_value)
+            except Exception as e:
+                unparsed.add(var)
+                errors.append(ParseError(var_name=var._fullname, exception=e))
+
+        for var, _, _ in changed:
+            if var not in unparsed:
+                errors.extend(var._get_errors())
+        if errors:
+            self._lazy_source = lazy_source
+            for var, old_value, old_raw_value in changed:
+                var._value = old_value
+                var._raw_value = old_raw_value
+                var._changed()
+            raise ValidationErrors(errors)
+
+        ret = {var._get_env_name(): (old, var._value) for var, old, _ in changed}
+        return ret
+
+    def _is_loadable(self, var: EnvVar) -> bool:
+        if isinstance(var, ComputedMixin):
+            return False
+
+        # Groups can opt out of loading
+        if var._parent is not self and not var._parent._load:
+            return False
+
+        return True
+
+    def _iter_loadable(self) -> Iterator[EnvVar]:
+        return (v for v in self._flat if self._is_loadable(v))
+
+    @property
+    def load_report(self) -> Optional[LoadReport]:
+        """
+        Report of the last load, None if the environ was never loaded.
+        """
+        return self._load_report
 
     def get_env_vars(self) -> Dict[str, str]:
         return self._get_env_vars()
 
+    @property
+    def env_index(self) -> Mapping[str, EnvVar]:
+        """
+        Read only mapping of environmental variable names to vars.
+        """
+        return MappingProxyType(self._get_env_index())
+
     def validate(self) -> None:
-        return self._validate()
+        self._validate()
 
-    def dump(self, path: Union[Path, str]) -> None:
+    def dump(self, path: Union[Path, str]) -> bool:
+        """
+        Atomically write environmental variables to path.
+
+        :return: False if the file already had the same content and was left untouched
+        """
         return self._dump(path)
 
-    def save_to_os_environ(self) -> None:
+    def export(self, f: IO[str], format: str = "json") -> None:
+        """
+        Validate and stream environmental variables to a text file object.
+
+        :param format: Name of a registered exporter: "json", "toml", "shell" or "systemd"
+        """
+        get_exporter(format)(f, self._iter_env_values())
+
+    def save_to_os_environ(self, delta: bool = False) -> None:
+        """
+        :param delta: Validate and write only vars changed since the last save,
+            vars that became None are removed from os.environ
+        """
+        if delta:
+            self._save_delta_to_os_environ()
+            return
+
         os.environ.update(self.get_env_vars())
+        self.__dict__["_dirty"] = set()
+
+    def _save_delta_to_os_environ(self) -> None:
+        self._get_env_index()
+
+        if self._dirty is None:
+            candidates = list(self._flat)
+        else:
+            # Computed vars that aren't memoized can change without being set
+            candidates = list(cast(Set[EnvVar], self._dirty) | self._volatile)
+            candidates.sort(key=lambda v: v._fullname)
+
+        errors: List[EnviumError] = []
+        values: List[Tuple[str, Any]] = []
+        for v in candidates:
+            value, var_errors = v._resolve()
+            errors.extend(var_errors)
+            values.append((v._get_env_name(), value))
+
+        if errors:
+            raise ValidationErrors(errors)
+
+        for name, value in values:
+            if value is None:
+                os.environ.pop(name, None)
+                continue
+
+            env_value = format_value(value)
+            if os.environ.get(name) != env_value:
+                os.environ[name] = env_value
+
+        self.__dict__["_dirty"] = set()
+
+    def derive(self, **values: Any) -> "EnvironLayer":
+        """
+        Return layer storing only given overrides and reading everything else from this environ.
+
+        Nested vars are given by dotted paths, e.g. env.derive(**{"db.name": "test"}).
+        """
+        return EnvironLayer(self, ChainMap()).derive(**values)
 
     def _get_env_vars(self) -> Dict[str, str]:
         """
@@ -131,38 +613,223 @@ class Environ(EnvGroup):
         :param owner_name:
         """
 
-        self._validate()
+        values = self._validate()
 
         envs = {}
         for v in self._flat:
             name = v._get_env_name()
-            value = v._get_value()
-            if isinstance(value, list):
-                envs[name] = comp.list_delimiter.join([str(v) for v in value])
-            else:
-                envs[name] = str(value)
+            envs[name] = format_value(values[v])
 
         envs = {k.upper(): v for k, v in envs.items()}
 
         return envs
 
+    def _iter_env_values(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Validate and return iterator of (env name, typed value) pairs.
+        """
+        values = self._validate()
+        return ((v._get_env_name(), values[v]) for v in self._flat)
+
+    def _get_env_index(self) -> Dict[str, EnvVar]:
+        flat = self._flat
+        if self._env_index_flat is flat:
+            return self._env_index
+
+        env_index: Dict[str, EnvVar] = {}
+        redefined: Set[EnvVar] = set()
+        volatile: Set[EnvVar] = set()
+        for v in flat:
+            env_name = v._get_env_name()
+            if isinstance(v, ComputedMixin) and v._fget and not v._cache:
+                volatile.add(v)
+
+            if env_name in env_index:
+                redefined.add(v)
+            else:
+                env_index[env_name] = v
+
+        self._env_index = env_index
+        self._redefined = redefined
+        self._volatile = volatile
+        self._env_index_flat = flat
+        return env_index
+
+    def _get_env_prefix(self) -> str:
+        ret = self._fullname.replace("_", "").replace("-", "").upper()
+        return ret
+
+    def _process(self) -> None:
+        super()._process()
+        self._get_env_index()
+
     @property
     def errors(self) -> List[EnviumError]:
+        self._get_env_index()
+
         ret: List[EnviumError] = []
-        env_names = []
         for v in self._flat:
-            env_name = v._get_env_name()
-
-            if env_name in env_names:
-                ret.append(RedefinedVarError(env_name))
-
-            env_names.append(env_name)
+            if v in self._redefined:
+                ret.append(RedefinedVarError(v._get_env_name()))
 
             ret.extend(v._get_errors())
 
         return ret
 
 
+class _LayerGroup:
+    """
+    View of an environ group that reads values through layer overrides.
+    """
+
+    __slots__ = ("_layer", "_group")
+
+    _layer: "EnvironLayer"
+    _group: VarGroup
+
+    def __init__(self, layer: "EnvironLayer", group: VarGroup) -> None:
+        object.__setattr__(self, "_layer", layer)
+        object.__setattr__(self, "_group", group)
+
+    def _get_child(self, name: str) -> BaseVar:
+        group = self._group
+        child: Optional[BaseVar] = (
+            group.__dict__.get(name) if name in group._schema else None
+        )
+        if child is None:
+            raise UndefinedVarError(parent_fullname=group._fullname, var_name=name)
+        return child
+
+    def __getattr__(self, name: str) -> Any:
+        group = self._group
+        if name not in group._schema and hasattr(group, name):
+            # Methods and other attributes that aren't vars come from the group itself
+            return getattr(group, name)
+
+        child = self._get_child(name)
+        if isinstance(child, VarGroup):
+            return _LayerGroup(self._layer, child)
+        return self._layer._get(cast(EnvVar, child))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        child = self._get_child(name)
+        if not isinstance(child, FinalVar):
+            raise EnviumError(f'Can\'t replace group "{child._fullname}" of a layer')
+
+        errors = cast(EnvVar, child)._check_value(value)
+        if errors:
+            raise ValidationErrors(errors)
+        self._layer._overrides.maps[0][child] = value
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self._group._fullname}>"
+
+
+class EnvironLayer(_LayerGroup):
+    """
+    Environ derived from a parent environ or layer that stores only its own overrides.
+
+    Reads fall through to parent layers and the base environ, so later changes of parents
+    are visible. Assignments change only this layer.
+    """
+
+    __slots__ = ("_overrides",)
+
+    _group: "Environ"
+    # Var -> value, own overrides first followed by overrides of parent layers
+    _overrides: ChainMap
+
+    def __init__(self, environ: "Environ", overrides: ChainMap) -> None:
+        super().__init__(self, environ)
+        object.__setattr__(self, "_overrides", overrides)
+
+    def derive(self, **values: Any) -> "EnvironLayer":
+        """
+        Return layer on top of this one, storing only given overrides.
+        """
+        own: Dict[EnvVar, Any] = {}
+        errors: List[EnviumError] = []
+        for path, value in values.items():
+            var = cast(EnvVar, self._group._get_var(path))
+            errors.extend(var._check_value(value))
+            own[var] = value
+
+        if errors:
+            raise ValidationErrors(errors)
+
+        return EnvironLayer(self._group, self._overrides.new_child(own))
+
+    def _get(self, var: EnvVar) -> Any:
+        overrides = self._overrides
+        if var in overrides:
+            return overrides[var]
+
+        if not isinstance(var, ComputedMixin) or not var._fget or var._async_get:
+            return var._get_value()
+
+        # Computed from values of this layer, so it's never memoized
+        evaluating = _evaluating.get()
+        if var in evaluating:
+            return var
+        token = _evaluating.set(evaluating + (var,))
+        try:
+            return var._fget(self)
+        finally:
+            _evaluating.reset(token)
+
+    def _resolve_all(self) -> Tuple[List[EnviumError], Dict[EnvVar, Any]]:
+        errors: List[EnviumError] = []
+        values: Dict[EnvVar, Any] = {}
+
+        for v in self._group._flat:
+            try:
+                value = self._get(v)
+            except Exception as e:
+                errors.append(ComputedVarError(var_name=v._fullname, exception=e))
+                values[v] = None
+                continue
+
+            values[v] = value
+            errors.extend(v._check_value(value))
+
+        return errors, values
+
+    @property
+    def errors(self) -> List[EnviumError]:
+        return self._resolve_all()[0]
+
+    def validate(self) -> None:
+        self._validate()
+
+    def _validate(self) -> Dict[EnvVar, Any]:
+        errors, values = self._resolve_all()
+        if errors:
+            raise ValidationErrors(errors)
+
+        return values
+
+    def _iter_env_values(self) -> Iterator[Tuple[str, Any]]:
+        values = self._validate()
+        return ((v._get_env_name(), values[v]) for v in self._group._flat)
+
+    def get_env_vars(self) -> Dict[str, str]:
+        return {k: format_value(v) for k, v in self._iter_env_values()}
+
+    def export(self, f: IO[str], format: str = "json") -> None:
+        """
+        Validate and stream merged environmental variables to a text file object.
+        """
+        get_exporter(format)(f, self._iter_env_values())
+
+    def dump(self, path: Union[Path, str]) -> bool:
+        """
+        Atomically write merged environmental variables to path.
+
+        :return: False if the file already had the same content and was left untouched
+        """
+        return write_atomic(Path(path), _format_env_file(self.get_env_vars()))
+
+
 def env_var(
     default: Optional[Any] = None,
     raw: Union[bool, str] = False,
@@ -174,9 +841,10 @@ def env_var(
 def computed_env_var(
     fget: Optional[Callable] = None,
     fset: Optional[Callable] = None,
-    raw: Union[bool, str] = False
+    raw: Union[bool, str] = False,
+    cache: bool = False,
 ) -> Any:
-    return ComputedEnvVar(fget, fset, raw=raw)
+    return ComputedEnvVar(fget, fset, raw=raw, cache=cache)
 
 
 Group = VarGroup
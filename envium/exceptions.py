@@ -1,4 +1,5 @@
-from typing import List, Type
+from pathlib import Path
+from typing import Any, List, Type
 
 
 class EnviumError(Exception):
@@ -46,6 +47,13 @@ class ComputedVarError(EnviumError):
         super().__init__(msg)
 
 
+class ParseError(EnviumError):
+    def __init__(self, var_name: str, exception: Exception) -> None:
+        self.var_name = var_name
+        msg = f'Parsing value of "{var_name}" failed with: {repr(exception)}'
+        super().__init__(msg)
+
+
 class UndefinedVarError(EnviumError):
     def __init__(self, parent_fullname: str, var_name: str) -> None:
         self.var_name = var_name
@@ -53,6 +61,34 @@ class UndefinedVarError(EnviumError):
         super().__init__(msg)
 
 
+class UnresolvedVarError(EnviumError):
+    def __init__(self, var_name: str) -> None:
+        self.var_name = var_name
+        msg = f'Async var "{var_name}" is not resolved, await aresolve() first'
+        super().__init__(msg)
+
+
+class FrozenError(EnviumError, AttributeError):
+    def __init__(self, type_name: str, var_name: str) -> None:
+        self.var_name = var_name
+        msg = f'Can\'t modify "{var_name}" of frozen "{type_name}"'
+        super().__init__(msg)
+
+
+class SecretProviderError(EnviumError):
+    def __init__(self, provider: Any, key: str, msg: str) -> None:
+        self.provider = provider
+        self.key = key
+        super().__init__(f'{provider!r} failed to fetch "{key}": {msg}')
+
+
+class EnvFileError(EnviumError):
+    def __init__(self, path: Path, line: int, msg: str) -> None:
+        self.path = path
+        self.line = line
+        super().__init__(f"{path}:{line}: {msg}")
+
+
 class ValidationErrors(EnviumError):
     errors: List[EnviumError]
 
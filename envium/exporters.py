@@ -0,0 +1,113 @@
+import json
+import shlex
+from enum import Enum
+from pathlib import PurePath
+from typing import IO, Any, Callable, Dict, Iterable, Tuple
+
+from envium.exceptions import EnviumError
+from envium.parsers import format_value
+
+__all__ = ["register_exporter", "get_exporter"]
+
+# Writes (env name, value) pairs to a text file object
+Exporter = Callable[[IO[str], Iterable[Tuple[str, Any]]], None]
+
+_exporters: Dict[str, Exporter] = {}
+
+
+def register_exporter(name: str) -> Callable[[Exporter], Exporter]:
+    """
+    Register function as exporter of given format, replacing already registered one.
+    """
+
+    def decorator(exporter: Exporter) -> Exporter:
+        _exporters[name] = exporter
+        return exporter
+
+    return decorator
+
+
+def get_exporter(name: str) -> Exporter:
+    try:
+        return _exporters[name]
+    except KeyError:
+        raise EnviumError(
+            f'Unknown export format "{name}", expected one of {sorted(_exporters)}'
+        ) from None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return format_value(value)
+
+
+@register_exporter("json")
+def export_json(f: IO[str], items: Iterable[Tuple[str, Any]]) -> None:
+    """
+    JSON object keeping value types, e.g. {"ENV_PORT": 80}.
+    """
+    sep = "\n"
+    f.write("{")
+    for key, value in items:
+        f.write(f"{sep}  {json.dumps(key)}: {json.dumps(value, default=_json_default)}")
+        sep = ",\n"
+    f.write("\n}\n" if sep != "\n" else "}\n")
+
+
+def _toml_str(value: str) -> str:
+    # JSON string escaping is a valid TOML basic string
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)) and not isinstance(value, Enum):
+        return repr(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"[{', '.join(_toml_value(v) for v in value if v is not None)}]"
+    if isinstance(value, dict):
+        pairs = (
+            f"{_toml_str(format_value(k))} = {_toml_value(v)}"
+            for k, v in value.items()
+            if v is not None
+        )
+        return f"{{{', '.join(pairs)}}}"
+    return _toml_str(_json_default(value))
+
+
+@register_exporter("toml")
+def export_toml(f: IO[str], items: Iterable[Tuple[str, Any]]) -> None:
+    """
+    TOML key/value pairs. TOML has no null so vars without value are skipped.
+    """
+    for key, value in items:
+        if value is None:
+            continue
+        f.write(f"{key} = {_toml_value(value)}\n")
+
+
+@register_exporter("shell")
+def export_shell(f: IO[str], items: Iterable[Tuple[str, Any]]) -> None:
+    """
+    POSIX shell "export KEY=value" lines, quoted so they can be sourced.
+    """
+    for key, value in items:
+        f.write(f"export {key}={shlex.quote(format_value(value))}\n")
+
+
+_SYSTEMD_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "$": "\\$", "`": "\\`"})
+
+
+@register_exporter("systemd")
+def export_systemd(f: IO[str], items: Iterable[Tuple[str, Any]]) -> None:
+    """
+    systemd EnvironmentFile, values are double quoted and can span multiple lines.
+    """
+    for key, value in items:
+        f.write(f'{key}="{format_value(value).translate(_SYSTEMD_ESCAPES)}"\n')
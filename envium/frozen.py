@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Type
+
+from envium.exceptions import FrozenError
+
+__all__ = ["FrozenGroup", "FrozenDict"]
+
+
+class FrozenDict(Mapping):
+    """
+    Read only, hashable dict.
+    """
+
+    __slots__ = ("_items", "_hash")
+    _items: Dict[Any, Any]
+    _hash: Optional[int]
+
+    def __init__(self, items: Dict[Any, Any]) -> None:
+        object.__setattr__(self, "_items", items)
+        object.__setattr__(self, "_hash", None)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._items[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(frozenset(self._items.items())))
+        return self._hash
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise FrozenError(self.__class__.__name__, key)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._items!r})"
+
+    def __copy__(self) -> Any:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return self
+
+
+class FrozenGroup:
+    """
+    Immutable snapshot of var group values.
+
+    Subclass with a slot per var is created for every VarGroup class. Own members are
+    private to the class, so they aren't hidden by slots of vars with the same name.
+    """
+
+    __slots__ = ()
+    __fields: Tuple[str, ...] = ()
+
+    def __init__(self, *values: Any) -> None:
+        for name, value in zip(self.__fields, values):
+            object.__setattr__(self, name, value)
+
+    def __values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, n) for n in self.__fields)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise FrozenError(self.__class__.__name__, key)
+
+    def __delattr__(self, key: str) -> None:
+        raise FrozenError(self.__class__.__name__, key)
+
+    # Immutable, copies can be shared
+    def __copy__(self) -> Any:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.__values() == other.__values()
+
+    def __hash__(self) -> int:
+        return hash(self.__values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__fields)
+        return f"{self.__class__.__name__}({fields})"
+
+
+def make_frozen_type(name: str, fields: Tuple[str, ...]) -> Type[FrozenGroup]:
+    return type(
+        name, (FrozenGroup,), {"__slots__": fields, "_FrozenGroup__fields": fields}
+    )
+
+
+def freeze_value(value: Any) -> Any:
+    """
+    Return immutable equivalent of value, converting builtin containers recursively.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(v) for v in value)
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze_value(v) for k, v in value.items()})
+    return value
@@ -0,0 +1,175 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+__all__ = ["Changes"]
+
+# Full name -> (old value, new value) of vars changed since the last notification
+Changes = Dict[str, Tuple[Any, Any]]
+
+# Value of watched vars that could not be evaluated, never reported to subscribers
+_UNKNOWN = object()
+
+
+def _get_value(var: Any, dependencies: Optional[Set[Any]] = None) -> Any:
+    # Notifications are shared by all tasks, so they never see overrides of one of them
+    try:
+        return var._get_shared_value(dependencies)
+    except Exception:
+        return _UNKNOWN
+
+
+class _Subscription:
+    __slots__ = ("callback", "vars")
+
+    def __init__(self, callback: Callable[[Changes], Any], vars: Set[Any]) -> None:
+        self.callback = callback
+        self.vars = vars
+
+
+class _Batch:
+    __slots__ = ("depth", "pending")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.pending: Set[Any] = set()
+
+
+class Observers:
+    """
+    Change subscriptions of a root var group.
+
+    Changed vars are collected while a batch is open and compared with values they had
+    at the last notification when the outermost batch closes, so each subscriber gets
+    one event per batch.
+
+    Batches are per thread, so a batch open in one thread doesn't hold back changes
+    made by others. Values are evaluated and callbacks are called outside the lock.
+
+    Volatile vars, which can change without being set, are re-evaluated only when vars
+    they read during their last evaluation change. Vars that can't be evaluated keep
+    their last known value, so subscribers only see changes between known values.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._subscriptions: List[_Subscription] = []
+        # Watched var -> value at the last notification
+        self._values: Dict[Any, Any] = {}
+        # Watched var that can change without being set, e.g. computed var that isn't
+        # memoized -> vars it read during its last evaluation
+        self._dependencies: Dict[Any, Set[Any]] = {}
+        # Vars read by volatile vars
+        self._sources: Set[Any] = set()
+        # Thread id -> open batch
+        self._batches: Dict[int, _Batch] = {}
+
+    def subscribe(
+        self, callback: Callable[[Changes], Any], vars: List[Any], volatile: Set[Any]
+    ) -> Callable[[], None]:
+        subscription = _Subscription(callback, set(vars))
+        with self._lock:
+            new = [v for v in vars if v not in self._values]
+        dependencies: Dict[Any, Set[Any]] = {v: set() for v in new if v in volatile}
+        values = {v: _get_value(v, dependencies.get(v)) for v in new}
+
+        with self._lock:
+            self._subscriptions.append(subscription)
+            for v, value in values.items():
+                if v not in self._values:
+                    self._values[v] = value
+                    if v in dependencies:
+                        self._dependencies[v] = dependencies[v]
+            self._update_sources()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+                    self._prune()
+
+        return unsubscribe
+
+    def _prune(self) -> None:
+        watched: Set[Any] = set()
+        for s in self._subscriptions:
+            watched |= s.vars
+
+        self._values = {v: value for v, value in self._values.items() if v in watched}
+        self._dependencies = {
+            v: d for v, d in self._dependencies.items() if v in watched
+        }
+        self._update_sources()
+
+    def _update_sources(self) -> None:
+        self._sources = set()
+        for d in self._dependencies.values():
+            self._sources |= d
+
+    def changed(self, var: Any) -> None:
+        with self._lock:
+            if var in self._values or var in self._sources:
+                self._get_batch().pending.add(var)
+
+    def begin(self) -> None:
+        with self._lock:
+            self._get_batch().depth += 1
+
+    def end(self) -> None:
+        thread_id = threading.get_ident()
+        with self._lock:
+            batch = self._batches[thread_id]
+            batch.depth -= 1
+            if batch.depth > 0:
+                return
+            del self._batches[thread_id]
+
+        self._flush(batch.pending)
+
+    def _get_batch(self) -> _Batch:
+        return self._batches.setdefault(threading.get_ident(), _Batch())
+
+    def _flush(self, pending: Set[Any]) -> None:
+        with self._lock:
+            # Vars unwatched since they were changed are skipped
+            watched = pending & self._values.keys()
+            watched |= {v for v, d in self._dependencies.items() if d & pending}
+            dependencies: Dict[Any, Set[Any]] = {
+                v: set() for v in watched if v in self._dependencies
+            }
+        if not watched:
+            return
+
+        new_values = [
+            (v, _get_value(v, dependencies.get(v)))
+            for v in sorted(watched, key=lambda v: v._fullname)
+        ]
+
+        changed: Dict[Any, Tuple[Any, Any]] = {}
+        with self._lock:
+            for v, d in dependencies.items():
+                if v in self._dependencies:
+                    self._dependencies[v] = d
+            self._update_sources()
+
+            for v, new in new_values:
+                if v not in self._values or new is _UNKNOWN:
+                    continue
+
+                old = self._values[v]
+                self._values[v] = new
+                if old is _UNKNOWN or new is old or new == old:
+                    continue
+
+                changed[v] = (old, new)
+
+            if not changed:
+                return
+
+            notifications = []
+            for s in self._subscriptions:
+                changes = {v._fullname: c for v, c in changed.items() if v in s.vars}
+                if changes:
+                    notifications.append((s.callback, changes))
+
+        for callback, changes in notifications:
+            callback(changes)
@@ -0,0 +1,179 @@
+import collections.abc
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Type, Union, cast
+
+from envium import comp
+
+__all__ = ["compile_parser", "format_value"]
+
+Parser = Callable[[str], Any]
+
+# Items of dict vars are stored as "key=value" pairs separated by this delimiter
+dict_delimiter = ","
+
+_TRUE_STRINGS = ("True", "true")
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+def _parse_bool(value: str) -> bool:
+    return value in _TRUE_STRINGS
+
+
+def _enum_parser(type_: Type[Enum]) -> Parser:
+    lookup: Dict[str, Enum] = {}
+    for member in type_:
+        lookup.setdefault(str(member.value), member)
+        lookup.setdefault(str(member), member)
+    lookup.update(type_.__members__)
+
+    def parse(value: str) -> Enum:
+        try:
+            return lookup[value]
+        except KeyError:
+            raise ValueError(f'"{value}" is not a valid {type_.__name__}') from None
+
+    return parse
+
+
+def _literal_parser(choices: tuple) -> Parser:
+    lookup = {str(c): c for c in reversed(choices)}
+
+    def parse(value: str) -> Any:
+        try:
+            return lookup[value]
+        except KeyError:
+            raise ValueError(f'"{value}" is not one of {list(choices)}') from None
+
+    return parse
+
+
+def _sequence_parser(container: Callable, item_parser: Parser) -> Parser:
+    if item_parser is _identity:
+        if container is list:
+            return lambda value: value.split(comp.list_delimiter)
+        return lambda value: container(value.split(comp.list_delimiter))
+
+    return lambda value: container(
+        [item_parser(i) for i in value.split(comp.list_delimiter)]
+    )
+
+
+def _fixed_tuple_parser(item_parsers: List[Parser]) -> Parser:
+    def parse(value: str) -> tuple:
+        items = value.split(comp.list_delimiter)
+        if len(items) != len(item_parsers):
+            raise ValueError(
+                f"Expected {len(item_parsers)} items separated by "
+                f'"{comp.list_delimiter}", got {len(items)}'
+            )
+        return tuple(p(i) for p, i in zip(item_parsers, items))
+
+    return parse
+
+
+def _dict_parser(key_parser: Parser, value_parser: Parser) -> Parser:
+    def parse(value: str) -> dict:
+        ret = {}
+        for item in value.split(dict_delimiter):
+            if not item:
+                continue
+            k, sep, v = item.partition("=")
+            if not sep:
+                raise ValueError(f'Expected "key=value" pair, got "{item}"')
+            ret[key_parser(k.strip())] = value_parser(v.strip())
+        return ret
+
+    return parse
+
+
+def _union_parser(parsers: List[Parser]) -> Parser:
+    def parse(value: str) -> Any:
+        for p in parsers:
+            try:
+                return p(value)
+            except (TypeError, ValueError):
+                continue
+        raise ValueError(f'Could not parse "{value}"')
+
+    return parse
+
+
+# Generic origin -> container type used for parsed values
+_SEQUENCE_ORIGINS: Dict[Any, Callable] = {
+    list: list,
+    set: set,
+    frozenset: frozenset,
+    collections.abc.Sequence: list,
+    collections.abc.MutableSequence: list,
+    collections.abc.Iterable: list,
+    collections.abc.Set: frozenset,
+    collections.abc.MutableSet: set,
+}
+
+_MAPPING_ORIGINS = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def compile_parser(type_: Optional[Any]) -> Parser:
+    """
+    Build a function converting environmental variable string to a value of given type.
+    """
+    if type_ is None or type_ is str or type_ is Any:
+        return _identity
+
+    if type_ is bool:
+        return _parse_bool
+
+    origin = typing.get_origin(type_)  # type: ignore
+    args = typing.get_args(type_)  # type: ignore
+
+    if origin is None:
+        if isinstance(type_, type) and issubclass(type_, Enum):
+            return _enum_parser(type_)
+        if type_ in (list, tuple, set, frozenset):
+            return _sequence_parser(type_, _identity)
+        if type_ is dict:
+            return _dict_parser(_identity, _identity)
+        # int, float, Path and any other type constructible from a string
+        return cast(Parser, type_)
+
+    if origin is typing.Literal:
+        return _literal_parser(args)
+
+    if origin is Union:
+        return _union_parser([compile_parser(a) for a in args if a is not type(None)])
+
+    if origin is tuple:
+        if not args or (len(args) == 2 and args[1] is Ellipsis):
+            item = compile_parser(args[0]) if args else _identity
+            return _sequence_parser(tuple, item)
+        return _fixed_tuple_parser([compile_parser(a) for a in args])
+
+    if origin in _SEQUENCE_ORIGINS:
+        item = compile_parser(args[0]) if args else _identity
+        return _sequence_parser(_SEQUENCE_ORIGINS[origin], item)
+
+    if origin in _MAPPING_ORIGINS:
+        if args:
+            return _dict_parser(compile_parser(args[0]), compile_parser(args[1]))
+        return _dict_parser(_identity, _identity)
+
+    return cast(Parser, origin)
+
+
+def format_value(value: Any) -> str:
+    """
+    Inverse of parsers built by compile_parser.
+    """
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return comp.list_delimiter.join(format_value(v) for v in value)
+    if isinstance(value, dict):
+        return dict_delimiter.join(
+            f"{format_value(k)}={format_value(v)}" for k, v in value.items()
+        )
+    return str(value)
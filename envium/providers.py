@@ -0,0 +1,179 @@
+import http.client
+import subprocess
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+from urllib.parse import quote, urlsplit
+
+from envium.envfile import iter_env_file
+from envium.exceptions import SecretProviderError
+
+__all__ = [
+    "SecretProvider",
+    "DirectoryProvider",
+    "EnvFileProvider",
+    "CommandProvider",
+    "HttpProvider",
+]
+
+
+class SecretProvider(ABC):
+    """
+    Source of secret values. Secrets of one provider are fetched in a single batch.
+    """
+
+    @abstractmethod
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Return values of given keys, keys the provider doesn't have are left out.
+        """
+        raise NotImplementedError
+
+
+class DirectoryProvider(SecretProvider):
+    """
+    Secrets mounted as files named after their keys, e.g. /run/secrets.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        ret = {}
+        for key in keys:
+            try:
+                ret[key] = (self.path / key).read_text(encoding="utf-8").rstrip("\n")
+            except FileNotFoundError:
+                continue
+        return ret
+
+
+class EnvFileProvider(SecretProvider):
+    """
+    Secrets stored as KEY=value pairs in an env file.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        wanted = set(keys)
+        return {k: v for k, v in iter_env_file(self.path) if k in wanted}
+
+
+class CommandProvider(SecretProvider):
+    """
+    Secrets printed by a command, e.g. ["pass", "show", "{key}"].
+
+    Commands of keys run in parallel, at most max_processes at once. "{key}" in the arguments
+    is replaced by the key. When a command fails or times out the remaining ones are killed.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        timeout: Optional[float] = None,
+        max_processes: int = 8,
+    ) -> None:
+        self.command = list(command)
+        self.timeout = timeout
+        self.max_processes = max_processes
+
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        ret: Dict[str, str] = {}
+        # Started processes in start order
+        running: Dict[str, subprocess.Popen] = {}
+        try:
+            for key in keys:
+                if len(running) >= self.max_processes:
+                    self._collect(running, ret)
+                running[key] = subprocess.Popen(
+                    [a.replace("{key}", key) for a in self.command],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+
+            while running:
+                self._collect(running, ret)
+        finally:
+            for process in running.values():
+                process.kill()
+                process.communicate()
+
+        return ret
+
+    def _collect(
+        self, running: Dict[str, subprocess.Popen], ret: Dict[str, str]
+    ) -> None:
+        """
+        Wait for the oldest running command and store its output.
+        """
+        key = next(iter(running))
+        process = running[key]
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise SecretProviderError(self, key, "Command timed out") from None
+
+        del running[key]
+        if process.returncode != 0:
+            raise SecretProviderError(
+                self, key, stderr.decode("utf-8", "replace").strip()
+            )
+        ret[key] = stdout.decode("utf-8").rstrip("\n")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.command!r})"
+
+
+class HttpProvider(SecretProvider):
+    """
+    Secrets served as plain text at "<url>/<key>" by a local vault, missing ones return 404.
+
+    All keys are fetched over one keep-alive connection.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = 10.0,
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        url = urlsplit(self.url)
+        connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        connection = connection_class(url.netloc, timeout=self.timeout)
+
+        ret = {}
+        try:
+            for key in keys:
+                connection.request(
+                    "GET", f"{url.path}/{quote(key)}", headers=self.headers
+                )
+                response = connection.getresponse()
+                body = response.read()
+
+                if response.status == 404:
+                    continue
+                if response.status != 200:
+                    raise SecretProviderError(
+                        self, key, f"HTTP {response.status} {response.reason}"
+                    )
+                ret[key] = body.decode("utf-8")
+        except (OSError, http.client.HTTPException) as e:
+            raise SecretProviderError(self, ", ".join(keys), repr(e)) from e
+        finally:
+            connection.close()
+
+        return ret
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.url!r})"
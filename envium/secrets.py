@@ -1,7 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from getpass import getpass
-from typing import TYPE_CHECKING, Any, Callable, List, Optional
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from envium.cache import SecretCache
 from envium.exceptions import EnviumError
+from envium.providers import SecretProvider
 
 if TYPE_CHECKING:
     pass
@@ -12,14 +24,26 @@ __all__ = ["secret", "Secrets", "computed_secret", "SecretsGroup"]
 
 
 class SecretVar(Var):
+    # Provider instance or name of a provider passed to Secrets
+    _provider: Union[SecretProvider, str, None]
+    # Key the provider knows the secret by, var name by default
+    _key: Optional[str]
+
     def __init__(
         self,
         default: Optional[Any] = None,
         default_factory: Optional[Callable] = None,
         value_from_input: bool = True,
+        provider: Union[SecretProvider, str, None] = None,
+        key: Optional[str] = None,
     ) -> None:
         super().__init__(default=default, default_factory=default_factory)
         self._value_from_input = value_from_input
+        self._provider = provider
+        self._key = key
+
+    def _get_key(self) -> str:
+        return self._key or self._name
 
 
 class ComputedSecretVar(ComputedMixin, SecretVar):
@@ -28,8 +52,9 @@ class ComputedSecretVar(ComputedMixin, SecretVar):
         fget: Optional[Callable] = None,
         fset: Optional[Callable] = None,
         value_from_input: bool = True,
+        cache: bool = False,
     ) -> None:
-        ComputedMixin.__init__(self, fget=fget, fset=fset)
+        ComputedMixin.__init__(self, fget=fget, fset=fset, cache=cache)
         SecretVar.__init__(self, value_from_input=value_from_input)
 
     pass
@@ -40,20 +65,99 @@ class SecretsGroup(VarGroup[SecretVar]):
 
 
 class Secrets(SecretsGroup):
-    def __init__(self, name: str = ""):
+    _providers: Dict[str, SecretProvider]
+    _cache: Optional[SecretCache]
+
+    def __init__(
+        self,
+        name: str = "",
+        providers: Optional[Mapping[str, SecretProvider]] = None,
+        cache: Optional[SecretCache] = None,
+    ):
+        """
+        :param providers: Providers that secrets can refer to by name
+        :param cache: Cache of fetched and entered secrets shared between constructions
+        """
         super().__init__(name=name)
+        self._providers = dict(providers or {})
+        self._cache = cache
         self._root = self
         self._process()
+        self._get_secrets_from_providers()
         self._get_secrets_from_input()
 
+        if cache:
+            cache.flush()
+
     def validate(self) -> None:
         self._validate()
 
+    def _get_provider(self, s: SecretVar) -> SecretProvider:
+        if isinstance(s._provider, SecretProvider):
+            return s._provider
+
+        try:
+            return self._providers[s._provider]
+        except KeyError:
+            raise EnviumError(
+                f'Unknown provider "{s._provider}" of secret "{s._fullname}"'
+            ) from None
+
+    def _get_secrets_from_providers(self) -> None:
+        """
+        Fetch secrets in one batch per provider, running providers concurrently.
+        """
+        batches: Dict[SecretProvider, List[SecretVar]] = {}
+        # Expired cached secrets that are refreshed in the background
+        stale: Dict[SecretProvider, Dict[str, str]] = {}
+        for s in self._flat:
+            if s._provider is None or isinstance(s, ComputedMixin):
+                continue
+
+            provider = self._get_provider(s)
+            if self._cache:
+                value, is_stale = self._cache._lookup(s._fullname, allow_stale=True)
+                if value is not None:
+                    setattr(s._parent, s._name, s._from_str(value))
+                    if is_stale:
+                        stale.setdefault(provider, {})[s._fullname] = s._get_key()
+                    continue
+
+            batches.setdefault(provider, []).append(s)
+
+        for provider, keys in stale.items():
+            self._cache.refresh(provider, keys)
+
+        if not batches:
+            return
+
+        def fetch(provider: SecretProvider) -> Dict[str, str]:
+            return provider.fetch(list({s._get_key(): None for s in batches[provider]}))
+
+        if len(batches) == 1:
+            results = [fetch(p) for p in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+                results = list(executor.map(fetch, batches))
+
+        for secrets, values in zip(batches.values(), results):
+            for s in secrets:
+                key = s._get_key()
+                if key in values:
+                    setattr(s._parent, s._name, s._from_str(values[key]))
+                    if self._cache:
+                        self._cache.set(s._fullname, values[key])
+
     def _get_secrets_from_input(self) -> None:
         for s in self._flat:
             if s._value_from_input:
-                value = s._from_str(getpass(f"{s._fullname}: "))
-                setattr(s._parent, s._name, value)
+                raw_value = self._cache.get(s._fullname) if self._cache else None
+                if raw_value is None:
+                    raw_value = getpass(f"{s._fullname}: ")
+                    if self._cache:
+                        self._cache.set(s._fullname, raw_value)
+
+                setattr(s._parent, s._name, s._from_str(raw_value))
 
     @property
     def errors(self) -> List[EnviumError]:
@@ -64,13 +168,22 @@ def secret(
     default: Optional[Any] = None,
     default_factory: Optional[Callable] = None,
     value_from_input: bool = True,
+    provider: Union[SecretProvider, str, None] = None,
+    key: Optional[str] = None,
 ) -> Any:
-    if default:
+    """
+    :param provider: Provider instance or name of a provider passed to Secrets,
+        the default value is kept when the provider doesn't have the secret
+    :param key: Key the provider knows the secret by, var name by default
+    """
+    if default or provider is not None:
         value_from_input = False
     return SecretVar(
         default=default,
         default_factory=default_factory,
         value_from_input=value_from_input,
+        provider=provider,
+        key=key,
     )
 
 
@@ -78,8 +191,11 @@ def computed_secret(
     fget: Optional[Callable] = None,
     fset: Optional[Callable] = None,
     value_from_input: bool = True,
+    cache: bool = False,
 ) -> Any:
-    return ComputedSecretVar(fget=fget, fset=fset, value_from_input=value_from_input)
+    return ComputedSecretVar(
+        fget=fget, fset=fset, value_from_input=value_from_input, cache=cache
+    )
 
 
 Group = VarGroup
@@ -1,20 +1,34 @@
+import asyncio
+import heapq
 import inspect
+import itertools
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 
 # Python >= 3.8
 import typing
 from abc import ABC, abstractmethod
 from copy import deepcopy
-from pathlib import Path
+from enum import Enum
+from pathlib import Path, PurePath
+from weakref import WeakKeyDictionary
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
+    ContextManager,
     Dict,
     Generic,
+    Iterator,
     List,
+    NamedTuple,
     Optional,
+    Set,
     Tuple,
     Type,
     TypeVar,
@@ -22,7 +36,6 @@ from typing import (
     cast,
 )
 
-from envium import comp
 from envium.exceptions import (
     ComputedVarError,
     EnviumError,
@@ -30,9 +43,13 @@ from envium.exceptions import (
     NoValueError,
     RedefinedVarError,
     UndefinedVarError,
+    UnresolvedVarError,
     ValidationErrors,
     WrongTypeError,
 )
+from envium.frozen import FrozenGroup, freeze_value, make_frozen_type
+from envium.observers import Changes, Observers
+from envium.parsers import Parser, compile_parser
 
 try:
     typing.get_args  # type: ignore
@@ -60,51 +77,308 @@ def get_type_class(typ) -> Any:
             return typ
 
 
+_IMMUTABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    type(None),
+    PurePath,
+    Enum,
+    frozenset,
+)
+
+
+def _share_or_copy(value: Any) -> Any:
+    """
+    Return value itself if it's immutable and can be shared between instances, copy otherwise.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+
+    if type(value) is tuple and all(_share_or_copy(i) is i for i in value):
+        return value
+
+    return deepcopy(value)
+
+
+class _Recorder:
+    """
+    Dependencies read by a memoized computed var during evaluation.
+    """
+
+    __slots__ = ("dependencies",)
+
+    def __init__(self) -> None:
+        self.dependencies: set = set()
+
+
+class _AtomicBlock:
+    """
+    Atomic update in progress, owned by the thread that entered it.
+    """
+
+    __slots__ = ("thread_id", "written")
+
+    def __init__(self) -> None:
+        self.thread_id = threading.get_ident()
+        # Var -> id of the last change the block made to it
+        self.written: Dict[Any, int] = {}
+
+
+class _Resolution:
+    """
+    Tasks of a running aresolve(), shared with the tasks through a context var.
+    """
+
+    __slots__ = ("tasks", "waiting")
+
+    def __init__(self) -> None:
+        self.tasks: Dict[Any, asyncio.Future] = {}
+        # Var -> unresolved var it's waiting for
+        self.waiting: Dict[Any, Any] = {}
+
+    async def wait(self, var: Any, dependency: Any) -> Any:
+        """
+        Wait until the task of dependency resolves, on behalf of var if it's being resolved.
+        """
+        if var is None:
+            return await asyncio.shield(self.tasks[dependency])
+
+        d = dependency
+        while d is not None:
+            if d is var:
+                raise EnviumError(
+                    f'Circular dependency between "{var._fullname}" '
+                    f'and "{dependency._fullname}"'
+                )
+            d = self.waiting.get(d)
+
+        self.waiting[var] = dependency
+        try:
+            return await asyncio.shield(self.tasks[dependency])
+        finally:
+            del self.waiting[var]
+
+
+# Recorder of the memoized computed var evaluated by the current task or thread
+_recorder: "ContextVar[Optional[_Recorder]]" = ContextVar(
+    "envium_recorder", default=None
+)
+# Computed vars whose fget or fset is running in the current task or thread.
+# Reading such var returns the var object instead of its value.
+_evaluating: "ContextVar[Tuple[FinalVar, ...]]" = ContextVar(
+    "envium_evaluating", default=()
+)
+
+# Values of overridden vars in the current task or thread
+_overrides: "ContextVar[Optional[Dict[FinalVar, Any]]]" = ContextVar(
+    "envium_overrides", default=None
+)
+# Active override scopes of all tasks, reads skip the overlay lookup while it's empty
+_override_scopes: List[object] = []
+
+# Running aresolve() and the var resolved by the current task
+_resolution: "ContextVar[Optional[_Resolution]]" = ContextVar(
+    "envium_resolution", default=None
+)
+_resolving: "ContextVar[Optional[FinalVar]]" = ContextVar(
+    "envium_resolving", default=None
+)
+# Set in event loops started to read async vars from synchronous code
+_sync_read: "ContextVar[bool]" = ContextVar("envium_sync_read", default=False)
+
+# Locks serializing atomic updates of var groups, kept outside so groups stay deep-copyable
+_write_locks: "WeakKeyDictionary[BaseVar, threading.RLock]" = WeakKeyDictionary()
+_write_locks_lock = threading.Lock()
+# Versions of var trees and ids of var changes,
+# published snapshots are valid while the version of their root is the same
+_versions = itertools.count(1)
+
+_NOT_CACHED = object()
+# Value of vars that are resolved on first access
+_PENDING = object()
+
+
+def _run_sync(func: Callable, *args: Any) -> Any:
+    """
+    Run coroutine function to completion in a new event loop.
+    """
+    token = _sync_read.set(True)
+    try:
+        return asyncio.run(func(*args))
+    finally:
+        _sync_read.reset(token)
+
+
+@contextmanager
+def _shared_values() -> Iterator[None]:
+    """
+    Read shared values of vars, ignoring overrides of the current task or thread.
+    """
+    if not _override_scopes:
+        yield
+        return
+
+    token = _overrides.set(None)
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def _get_write_lock(group: "BaseVar") -> threading.RLock:
+    lock = _write_locks.get(group)
+    if lock is None:
+        with _write_locks_lock:
+            lock = _write_locks.setdefault(group, threading.RLock())
+    return lock
+
+
 class BaseVar(ABC, Generic[VarType]):
     # will be injected by parent
     _root: Optional["VarGroup"]
     _parent: Optional["BaseVar"]
     _name: str
+    # Computed when the var is bound to the tree
+    _fullname: str
     _ready: bool
 
     def __init__(self) -> None:
         self._root = None
         self._parent = None
         self._name = ""
+        self._fullname = ""
         self._ready = False
 
-    @property
-    def _fullname(self) -> str:
+    def _compute_fullname(self) -> str:
         ret = f"{self._parent._fullname}.{self._name}" if self._parent else self._name
         return ret
 
+    def _bind(self, name: str, parent: "VarGroup") -> None:
+        self._name = name
+        self._root = parent._root
+        self._parent = parent
+        self._fullname = sys.intern(self._compute_fullname())
+
+    def _clone(self) -> "BaseVar":
+        """
+        Return unbound copy of this var that is ready to be bound to a new parent.
+
+        Mutable attributes are copied so clones don't share them, child vars of groups
+        are cloned by the group.
+        """
+        ret = object.__new__(self.__class__)
+        ret.__dict__.update(
+            (k, v if isinstance(v, BaseVar) else _share_or_copy(v))
+            for k, v in self.__dict__.items()
+        )
+        ret.__dict__.update(_root=None, _parent=None, _ready=False)
+        return ret
+
 
 class FinalVar(BaseVar, ABC, Generic[VarType]):
     _type_: Optional[Type]
     _optional: bool
+    # Converts strings to values of _type_, compiled once per class schema
+    _parser: Parser
     _value: Optional[VarType]
 
     _final: ClassVar[bool] = True
     _ready: bool
+    # Memoized computed vars that read this var during their last evaluation
+    _dependents: set
+    # Id of the last change, tells atomic blocks whether someone else changed the var since
+    _change_id: int
 
     def __init__(self) -> None:
         super().__init__()
 
         self._type_ = None
         self._optional = False
+        self._parser = compile_parser(None)
         self._value = None
+        self._dependents = set()
+        self._change_id = 0
 
     @abstractmethod
     def _init_value(self) -> None:
         raise NotImplementedError
 
     @abstractmethod
+    def _resolve(self) -> Tuple[Any, List[EnviumError]]:
+        """
+        Evaluate value once and return it together with its validation errors.
+        """
+        raise NotImplementedError
+
     def _get_errors(self) -> List[EnviumError]:
-        return []
+        return self._resolve()[1]
 
     def __repr__(self) -> str:
         return f"{self._fullname}"
 
+    def _clone(self) -> "FinalVar":
+        ret = cast(FinalVar, super()._clone())
+        ret._dependents = set()
+        return ret
+
+    def _changed(self) -> None:
+        root = self._root
+        observers = None
+        if root is not None:
+            if root._dirty is not None:
+                root._dirty.add(self)
+            observers = root._observers
+
+            self._change_id = change_id = next(_versions)
+            block = root._atomic_block
+            if block is not None and block.thread_id == threading.get_ident():
+                block.written[self] = change_id
+            else:
+                # Published snapshots are rebuilt on the next read
+                root.__dict__["_version"] = change_id
+
+        if observers is None:
+            for d in list(self._dependents):
+                d._invalidate()
+            return
+
+        # Invalidated dependents are reported in the same notification
+        observers.begin()
+        try:
+            observers.changed(self)
+            for d in list(self._dependents):
+                d._invalidate()
+        finally:
+            observers.end()
+
+    def _get_shared_value(self, dependencies: Optional[set] = None) -> Any:
+        """
+        Return value shared by all tasks, ignoring overrides of the current one.
+
+        :param dependencies: Set collecting vars read while evaluating the value
+        """
+        if dependencies is None:
+            with _shared_values():
+                return self._get_value()
+
+        recorder = _Recorder()
+        token = _recorder.set(recorder)
+        try:
+            with _shared_values():
+                return self._get_value()
+        finally:
+            _recorder.reset(token)
+            dependencies |= recorder.dependencies
+
+    def _resolve_pending(self) -> None:
+        """
+        Set value of a var marked as pending. Implemented by vars supporting lazy loading.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def _get_value(self) -> Any:
         raise NotImplementedError
@@ -132,173 +406,457 @@ class Var(FinalVar, Generic[VarType]):
 
     def _init_value(self):
         if not self._value:
-            self._value = self._default
+            self._value = self._get_default()
+
+    def _get_default(self) -> Optional[VarType]:
+        # Shared prototype defaults are copied only when they're mutable
+        if self._default_factory:
+            return cast(VarType, self._default_factory())
+
+        return cast(VarType, _share_or_copy(self._default))
 
     def _get_value(self) -> Any:
+        if _override_scopes:
+            overlay = _overrides.get()
+            if overlay is not None and self in overlay:
+                return overlay[self]
+
+        if self._value is _PENDING:
+            self._resolve_pending()
         return self._value
 
     def _set_value(self, new_value) -> None:
         self._value = new_value
 
-    def _get_errors(self) -> List[EnviumError]:
+    def _resolve(self) -> Tuple[Any, List[EnviumError]]:
+        value = self._get_value()
+        return value, self._check_value(value)
+
+    def _check_value(self, value: Any) -> List[EnviumError]:
         ret: List[EnviumError] = []
 
-        # Try evaluating value first. There might be some issues with that
         if not self._type_:
             return [NoTypeError(var_name=self._fullname)]
 
-        if not self._optional and self._get_value() is None:
-            ret.append(NoValueError(type_=self._type_, var_name=self._fullname))
-        elif self._get_value() is not None:
+        if value is None:
+            if not self._optional:
+                ret.append(NoValueError(type_=self._type_, var_name=self._fullname))
+        else:
             try:
-                if self._type_ and not isinstance(self._get_value(), self._type_):
+                if not isinstance(value, self._type_):
                     ret.append(
                         WrongTypeError(
                             type_=self._type_,
                             var_name=self._fullname,
-                            got_type=type(self._get_value()),
+                            got_type=type(value),
                         )
                     )
             except TypeError:
                 # isinstance will fail for types like Union[] etc
                 pass
 
-        return super()._get_errors() + ret
+        return ret
 
     def _from_str(self, env_value: str) -> VarType:
-        ret: Any
-        if self._type_ is bool:
-            ret = env_value in ("True", "true")
-        elif issubclass(get_type_class(self._type_), list):
-            ret = env_value.split(comp.list_delimiter)
-        else:
-            ret = self._type_(env_value)
-
-        ret_casted = cast(VarType, ret)
+        ret_casted = cast(VarType, self._parser(env_value))
         return ret_casted
 
 
 class ComputedMixin(Var):
     _fget: Optional[Callable]
     _fset: Optional[Callable]
+    _cache: bool
+    _cached_value: Any
+    _dependencies: set
+    # Coroutine function accessors, values resolved by aresolve() are kept until
+    # their dependencies change
+    _async_get: bool
+    _async_set: bool
 
     def __init__(
         self,
         fget: Optional[Callable] = None,
         fset: Optional[Callable] = None,
+        cache: bool = False,
     ) -> None:
         super().__init__()
         self._fget = fget
         self._fset = fset
+        self._cache = cache
+        self._cached_value = _NOT_CACHED
+        self._dependencies = set()
+        self._async_get = inspect.iscoroutinefunction(fget)
+        self._async_set = inspect.iscoroutinefunction(fset)
+
+    def _clone(self) -> "ComputedMixin":
+        ret = cast(ComputedMixin, super()._clone())
+        ret._cached_value = _NOT_CACHED
+        ret._dependencies = set()
+        return ret
 
     def _init_value(self):
-        self._value = self._get_value()
+        # Async vars are resolved on first access or by aresolve()
+        if self._async_get:
+            return
+
+        try:
+            self._value = self._get_value()
+        except UnresolvedVarError:
+            pass
 
     def _get_value(self) -> Any:
-        object.__setattr__(self, "_ready", False)
-        if self._fget:
-            ret = self._fget(self._root)
-        else:
-            ret = self._value
-        object.__setattr__(self, "_ready", True)
+        if _override_scopes:
+            overlay = _overrides.get()
+            if overlay is not None:
+                if self in overlay:
+                    return overlay[self]
+                # Memoized values don't account for overrides
+                if self._fget and not self._async_get:
+                    return self._evaluate()
+
+        if self._cached_value is not _NOT_CACHED:
+            return self._cached_value
+
+        # Values can be memoized only once the whole tree is initialized
+        if self._cache and self._fget and self._root and self._root._ready:
+            return self._get_value_memoized()
+
+        if not self._fget:
+            return self._value
+
+        return self._evaluate()
+
+    def _evaluate(self) -> Any:
+        token = _evaluating.set(_evaluating.get() + (self,))
+        try:
+            ret = self._call_fget()
+        finally:
+            _evaluating.reset(token)
+        return ret
+
+    def _call_fget(self) -> Any:
+        if self._async_get:
+            return self._run_async(self._fget)
+        return self._fget(self._root)
+
+    def _get_value_memoized(self) -> Any:
+        recorder = _Recorder()
+        recorder_token = _recorder.set(recorder)
+        token = _evaluating.set(_evaluating.get() + (self,))
+        try:
+            ret = self._call_fget()
+        finally:
+            _evaluating.reset(token)
+            _recorder.reset(recorder_token)
+
+        self._set_dependencies(recorder.dependencies)
+        self._cached_value = ret
         return ret
 
+    def _set_dependencies(self, dependencies: set) -> None:
+        """
+        Register as dependent of vars read during the last evaluation.
+        """
+        dependencies.discard(self)
+
+        for d in self._dependencies - dependencies:
+            d._dependents.discard(self)
+        for d in dependencies:
+            d._dependents.add(self)
+
+        self._dependencies = dependencies
+
+    def _invalidate(self) -> None:
+        if self._cached_value is _NOT_CACHED:
+            return
+
+        self._cached_value = _NOT_CACHED
+        self._changed()
+
+    def _changed(self) -> None:
+        self._cached_value = _NOT_CACHED
+        super()._changed()
+
+    def _run_async(self, func: Callable, *args: Any) -> Any:
+        """
+        Run coroutine function outside of an event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _run_sync(func, self._root, *args)
+
+        if not _sync_read.get():
+            raise UnresolvedVarError(var_name=self._fullname)
+
+        # Nested read of a synchronous one, its loop is blocked anyway so the var gets
+        # a loop of its own in another thread. Context is copied to record dependencies.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            context = copy_context()
+            return executor.submit(
+                context.run, _run_sync, func, self._root, *args
+            ).result()
+
+    async def _aresolve(self) -> Any:
+        recorder = _Recorder()
+        token = _recorder.set(recorder)
+        try:
+            value = await self._fget(self._root)
+        finally:
+            _recorder.reset(token)
+
+        self._set_dependencies(recorder.dependencies)
+        # Dependents are invalidated before the new value is cached
+        FinalVar._changed(self)
+        self._cached_value = value
+        return value
+
     def _set_value(self, new_value) -> None:
-        object.__setattr__(self, "_ready", False)
-        if self._fset:
-            self._fset(self._root, new_value)
-        else:
+        if self._async_set:
+            self._run_async(self._fset, new_value)
+            return
+
+        if not self._fset:
             self._value = new_value
-        object.__setattr__(self, "_ready", True)
+            return
 
-    def _get_errors(self) -> List[EnviumError]:
+        token = _evaluating.set(_evaluating.get() + (self,))
+        try:
+            self._fset(self._root, new_value)
+        finally:
+            _evaluating.reset(token)
+
+    def _resolve(self) -> Tuple[Any, List[EnviumError]]:
         try:
-            self._get_value()
+            value = self._get_value()
         except Exception as e:
-            return [ComputedVarError(var_name=self._fullname, exception=e)]
+            return None, [ComputedVarError(var_name=self._fullname, exception=e)]
+
+        return value, self._check_value(value)
+
+
+def _make_accessor(name: str, proto: FinalVar) -> property:
+    """
+    Build a data descriptor giving attribute access to the value of var "name".
+
+    Var objects live in the instance __dict__ under the same name, the descriptor
+    takes precedence over it so reads skip the generic attribute machinery.
+    """
+
+    if type(proto)._get_value is Var._get_value:
+
+        def fget(group: "VarGroup") -> Any:
+            var = group.__dict__[name]
+            if not var._ready:
+                return var
+            recorder = _recorder.get()
+            if recorder is not None:
+                recorder.dependencies.add(var)
+            if _override_scopes:
+                return var._get_value()
+            value = var._value
+            if value is _PENDING:
+                return var._get_value()
+            return value
+
+    else:
+
+        def fget(group: "VarGroup") -> Any:
+            var = group.__dict__[name]
+            if not var._ready or var in _evaluating.get():
+                return var
+            recorder = _recorder.get()
+            if recorder is not None:
+                recorder.dependencies.add(var)
+            return var._get_value()
+
+    def fset(group: "VarGroup", value: Any) -> None:
+        var = group.__dict__.get(name)
+        if isinstance(var, FinalVar) and var._ready and var not in _evaluating.get():
+            var._set_value(value)
+            var._changed()
+        else:
+            group.__dict__[name] = value
+
+    return property(fget, fset)
+
+
+class VarSpec(NamedTuple):
+    """
+    Class level description of a declared var, computed once per VarGroup subclass.
+    """
 
-        return super()._get_errors()
+    name: str
+    # Class level var object that gets copied to each instance
+    prototype: BaseVar
+    is_group: bool
+    type_: Optional[Type]
+    optional: bool
+    parser: Optional[Parser]
+
+
+def _resolve_type(type_: Optional[Type]) -> Tuple[Optional[Type], bool]:
+    optional = typing.get_origin(type_) is Union and type(None) in typing.get_args(type_)  # type: ignore
+
+    if optional:
+        return typing.get_args(type_)[0], True  # type: ignore
+
+    return type_, False
 
 
 class VarGroup(BaseVar[VarType]):
     _children: List[VarType]
+    # Sorted final vars of the whole subtree, None when it has to be rebuilt
+    _flat_index: Optional[List[VarType]]
+    _schema: ClassVar[Dict[str, VarSpec]] = {}
+    # Slotted type of frozen snapshots, with a slot per var of the schema
+    _frozen_type: ClassVar[Type[FrozenGroup]] = FrozenGroup
+    # Root version and snapshot published by the last atomic update or read of published
+    _published: Optional[Tuple[int, FrozenGroup]]
+    # Bumped on the root by every change made outside an atomic block
+    _version: int
+    # Atomic update in progress, set on the root
+    _atomic_block: Optional[_AtomicBlock]
+    # Vars changed since the root last marked its values clean, None when not tracked
+    _dirty: Optional[Set[FinalVar]]
+    # Change subscriptions, created on the root by the first subscribe()
+    _observers: Optional[Observers]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # Walk the whole mro so vars declared on plain mixins are found too,
+        # the nearest definition wins like with regular attribute lookup
+        prototypes: Dict[str, BaseVar] = {}
+        # Vars that need an accessor on this class as none of the bases provides it
+        needs_accessor: Set[str] = set()
+        for c in reversed(cls.__mro__):
+            schema = c.__dict__.get("_schema")
+            for n, v in list(c.__dict__.items()):
+                if schema is not None and n in schema:
+                    prototypes[n] = schema[n].prototype
+                    needs_accessor.discard(n)
+                elif isinstance(v, BaseVar):
+                    prototypes[n] = v
+                    needs_accessor.add(n)
+                else:
+                    prototypes.pop(n, None)
+                    needs_accessor.discard(n)
+
+        for n in needs_accessor:
+            v = prototypes[n]
+            if isinstance(v, FinalVar):
+                setattr(cls, n, _make_accessor(n, v))
+
+        annotations: Dict[str, Any] = {}
+        for c in reversed(cls.__mro__):
+            annotations.update(c.__dict__.get("__annotations__", {}))
+
+        schema = {}
+        for n, v in prototypes.items():
+            if isinstance(v, VarGroup):
+                schema[n] = VarSpec(n, v, True, None, False, None)
+            else:
+                type_, optional = _resolve_type(annotations.get(n, None))
+                schema[n] = VarSpec(n, v, False, type_, optional, compile_parser(type_))
+
+        cls._schema = schema
+        cls._frozen_type = make_frozen_type(f"Frozen{cls.__name__}", tuple(schema))
 
     def __init__(self, name: str = ""):
         super().__init__()
         self._children = []
+        self._flat_index = None
+        self._published = None
+        self._version = 0
+        self._atomic_block = None
+        self._dirty = None
+        self._observers = None
         self._name = name
+        self._fullname = name
 
         # Create copy of the var class attributes and assign them to the instance
-        for f in dir(self):
-            attr = inspect.getattr_static(self, f)
+        for n, spec in self._schema.items():
+            self.__dict__[n] = spec.prototype._clone()
+
+    def _clone(self) -> "VarGroup":
+        ret = cast(VarGroup, super()._clone())
+        ret.__dict__.update(
+            _children=[],
+            _flat_index=None,
+            _published=None,
+            _version=0,
+            _atomic_block=None,
+            _dirty=None,
+            _observers=None,
+        )
+
+        for n in self._schema:
+            ret.__dict__[n] = self.__dict__[n]._clone()
 
-            if isinstance(attr, BaseVar):
-                setattr(self, f, deepcopy(attr))
+        return ret
 
     def _process(self) -> None:
         self._children.clear()
 
-        annotations = [
-            c.__annotations__
-            for c in self.__class__.__mro__
-            if hasattr(c, "__annotations__")
-        ]
-        flat_annotations = {}
-
-        for a in reversed(annotations):
-            flat_annotations.update(a)
-
-        for n in dir(self):
-            v = inspect.getattr_static(self, n)
-
-            if v is self._root:
-                continue
-
-            if v is self._parent:
-                continue
-
-            if not isinstance(v, BaseVar):
-                continue
-
-            v = cast(TypeVar, v)
+        if self._parent is None:
+            self._fullname = sys.intern(self._compute_fullname())
 
-            v._name = n
-            v._root = self._root
-            v._parent = self
+        for spec in self._schema.values():
+            v = self.__dict__[spec.name]
+            v._bind(spec.name, self)
 
             self._children.append(v)
 
-            if isinstance(v, VarGroup):
+            if spec.is_group:
                 v._process()
-            elif isinstance(v, FinalVar):
-                type_ = flat_annotations.get(n, None)
-                optional = typing.get_origin(type_) is Union and type(None) in typing.get_args(type_)  # type: ignore
-                v._optional = optional
-
-                if optional:
-                    v._type_ = typing.get_args(type_)[0]  # type: ignore
-                else:
-                    v._type_ = type_
+            else:
+                v._type_ = spec.type_
+                v._optional = spec.optional
+                v._parser = spec.parser
                 v._init_value()
 
             v._ready = True
 
+        self._flat_index = self._build_flat()
         self._ready = True
 
-    @property
-    def _flat(self) -> List[VarType]:
-        ret: List[VarType] = []
+    def _build_flat(self) -> List[VarType]:
+        final_vars: List[VarType] = []
+        sublists: List[List[VarType]] = []
         for c in self._children:
             if isinstance(c, VarGroup):
-                ret.extend(c._flat)
+                sublists.append(c._flat)
             elif isinstance(c, FinalVar):
-                c = cast(VarType, c)
-                ret.append(c)
+                final_vars.append(cast(VarType, c))
 
-        ret = sorted(ret, key=lambda x: x._fullname)
+        key = lambda x: x._fullname
+        final_vars.sort(key=key)
+        # Children indexes are already sorted so merging is linear
+        ret = list(heapq.merge(final_vars, *sublists, key=key))
         return ret
 
+    def _invalidate_flat(self) -> None:
+        group: Optional[BaseVar] = self
+        while isinstance(group, VarGroup):
+            group._flat_index = None
+            group = group._parent
+
+        # Vars were replaced, so all of them have to be treated as changed
+        if isinstance(self._root, VarGroup):
+            self._root.__dict__["_dirty"] = None
+
+    @property
+    def _flat(self) -> List[VarType]:
+        if self._flat_index is None:
+            self._flat_index = self._build_flat()
+        return self._flat_index
+
     def copy_from(self, var_group: "VarGroup") -> None:
+        with self._batch():
+            self._copy_from(var_group)
+
+    def _copy_from(self, var_group: "VarGroup") -> None:
         left = {v._name: v for v in self._children}
         right = {v._name: v for v in var_group._children}
 
@@ -309,50 +867,411 @@ class VarGroup(BaseVar[VarType]):
                 continue
 
             if isinstance(l, VarGroup):
-                l.copy_from(r)
+                l._copy_from(r)
             else:
+                if r._value is _PENDING:
+                    r._resolve_pending()
                 l._value = r._value
+                l._changed()
 
     def __setattr__(self, key: str, value: Any) -> None:
-        if not hasattr(self, key):
-            if hasattr(self, "_ready") and self._ready:
-                raise UndefinedVarError(parent_fullname=self._fullname, var_name=key)
-            object.__setattr__(self, key, value)
-            return
+        if (
+            key not in self._schema
+            and self.__dict__.get("_ready", False)
+            and not hasattr(self, key)
+        ):
+            raise UndefinedVarError(parent_fullname=self._fullname, var_name=key)
+
+        old = self.__dict__.get(key)
+        object.__setattr__(self, key, value)
+
+        if (
+            key in self._schema
+            and isinstance(old, VarGroup)
+            and old._ready
+            and isinstance(value, VarGroup)
+        ):
+            self._replace_child(old, value)
+
+    def _replace_child(self, old: "VarGroup", new: "VarGroup") -> None:
+        new._bind(old._name, self)
+        new._process()
+        new._ready = True
+
+        self._children = [cast(VarType, new) if c is old else c for c in self._children]
+        self._invalidate_flat()
+
+    def _resolve_all(self) -> Tuple[List[EnviumError], Dict[VarType, Any]]:
+        """
+        Evaluate every var of the subtree exactly once.
+
+        Return validation errors together with resolved values so they can be reused by the caller.
+        """
+        errors: List[EnviumError] = []
+        values: Dict[VarType, Any] = {}
 
-        attr = object.__getattribute__(self, key)
+        for v in self._flat:
+            value, var_errors = v._resolve()
+            values[v] = value
+            errors.extend(var_errors)
 
-        if not isinstance(attr, FinalVar):
-            object.__setattr__(self, key, value)
-            return
+        return errors, values
+
+    @property
+    def _errors(self) -> List[EnviumError]:
+        return self._resolve_all()[0]
+
+    def freeze(self) -> Any:
+        """
+        Validate and return immutable, hashable snapshot of resolved values.
+
+        Computed vars are evaluated once and containers are converted to immutable ones,
+        so the snapshot can be shared between threads.
+        """
+        return self._freeze(self._validate())
+
+    def _freeze(self, values: Dict[VarType, Any]) -> FrozenGroup:
+        """
+        Build immutable snapshot of the subtree from resolved values.
+        """
+        args = []
+        for n, spec in self._schema.items():
+            v = self.__dict__[n]
+            if spec.is_group:
+                args.append(v._freeze(values))
+            else:
+                args.append(freeze_value(values[v]))
+
+        return self._frozen_type(*args)
+
+    def atomic(self) -> ContextManager[Any]:
+        """
+        Context manager for changes that concurrent readers of published see all at once.
+
+        Changes are validated and published as a frozen snapshot when the block exits,
+        invalid changes are reverted. Only published is safe to read without locking,
+        readers of the vars themselves can see changes of the block one by one.
+        """
+        return self._atomic()
+
+    @contextmanager
+    def _atomic(self) -> Iterator["VarGroup"]:
+        """
+        Apply changes made inside the block and publish them as a new frozen snapshot.
+
+        Writers of all groups of the tree are serialized. Changes of the block are reverted if it
+        raises or values are invalid, the previous snapshot stays published in that case.
+        Changes made concurrently outside atomic blocks are kept.
+        """
+        root = cast(VarGroup, self._root)
+        with _get_write_lock(root):
+            outer = root._atomic_block
+            if outer is None:
+                # Readers get the last snapshot while the block is open, so it's made current
+                self._refresh_published()
+
+            block = _AtomicBlock()
+            saved = {v: v._value for v in root._flat}
+            root.__dict__["_atomic_block"] = block
+            previous_version = version = root._version
+            try:
+                yield self
+                if outer is not None:
+                    # Nested block, changes are published by the outer one
+                    with _shared_values():
+                        self._validate()
+                    return
+
+                # Changes made after the version is taken make the snapshot stale
+                previous_version = root._version
+                version = next(_versions)
+                root.__dict__["_version"] = version
+                with _shared_values():
+                    published = self._freeze(self._validate())
+            except BaseException:
+                # Previous snapshot is still valid unless vars were changed outside the block
+                if root._version == version:
+                    root.__dict__["_version"] = previous_version
+                for v, change_id in block.written.items():
+                    # Skip vars changed concurrently outside the block since
+                    if v in saved and v._change_id == change_id:
+                        v._value = saved[v]
+                        v._changed()
+                raise
+            finally:
+                root.__dict__["_atomic_block"] = outer
+                if outer is not None:
+                    outer.written.update(block.written)
+
+            # Single reference assignment, readers see either the old or the new snapshot
+            self.__dict__["_published"] = (version, published)
+
+    async def aget(self, name: str) -> Any:
+        """
+        Return value of var "name", awaiting its fget when it's a coroutine function.
+
+        Async fgets should read other async vars this way. During aresolve() it waits for
+        the evaluation that is already running instead of starting the fget over.
+        """
+        var = self.__dict__.get(name)
+        if not isinstance(var, ComputedMixin) or not var._async_get:
+            return getattr(self, name)
+
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.dependencies.add(var)
+
+        resolution = _resolution.get()
+        if resolution is not None and var in resolution.tasks:
+            return await resolution.wait(_resolving.get(), var)
 
-        if not attr._ready:
-            object.__setattr__(self, key, value)
+        try:
+            return getattr(self, name)
+        except UnresolvedVarError:
+            return await var._aresolve()
+
+    async def aset(self, name: str, value: Any) -> None:
+        """
+        Set value of var "name", awaiting its fset when it's a coroutine function.
+        """
+        var = self.__dict__.get(name)
+        if not isinstance(var, ComputedMixin) or not var._async_set:
+            setattr(self, name, value)
             return
-        else:
-            attr._set_value(value)
 
-    def __getattribute__(self, item: str) -> Any:
-        attr = object.__getattribute__(self, item)
+        await var._fset(self._root, value)
+        var._changed()
 
-        if not isinstance(attr, FinalVar):
-            return attr
+    async def aresolve(self) -> None:
+        """
+        Concurrently evaluate computed vars with async fget and cache their values.
 
-        if not attr._ready:
-            return attr
+        Call it again to refresh them. In a running event loop async vars can't be read
+        before they are resolved.
+        """
+        await self._aresolve_all()
 
-        return attr._get_value()
+    async def _aresolve_all(self) -> None:
+        """
+        Evaluate all async computed vars of the subtree concurrently.
 
-    @property
-    def _errors(self) -> List[EnviumError]:
-        ret: List[EnviumError] = []
-        for v in self._flat:
-            ret.extend(v._get_errors())
+        Fgets reading async vars through aget() wait for their tasks. When fget reads an async
+        var that isn't resolved yet as a plain attribute, it's retried after that var resolves.
+        """
+        async_vars = [
+            v for v in self._flat if isinstance(v, ComputedMixin) and v._async_get
+        ]
+        by_name = {v._fullname: v for v in async_vars}
+        resolution = _Resolution()
+
+        async def resolve(var: ComputedMixin) -> Any:
+            _resolving.set(var)
+            while True:
+                try:
+                    return await var._aresolve()
+                except UnresolvedVarError as e:
+                    dependency = by_name.get(e.var_name)
+                    if dependency is None:
+                        raise
+                await resolution.wait(var, dependency)
+
+        for v in async_vars:
+            v._cached_value = _NOT_CACHED
+
+        # Tasks copy the current context, so they all see the resolution
+        token = _resolution.set(resolution)
+        try:
+            for v in async_vars:
+                resolution.tasks[v] = asyncio.ensure_future(resolve(v))
+        finally:
+            _resolution.reset(token)
+
+        tasks = resolution.tasks
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        # Cancellation and other exceptions that aren't errors of fgets are propagated
+        for r in results:
+            if isinstance(r, BaseException) and not isinstance(r, Exception):
+                raise r
+
+        errors: List[EnviumError] = [
+            ComputedVarError(var_name=v._fullname, exception=r)
+            for v, r in zip(tasks, results)
+            if isinstance(r, Exception)
+        ]
+        if errors:
+            raise ValidationErrors(errors)
+
+    def _get_node(self, path: str) -> BaseVar:
+        """
+        Return var or group by its dotted path relative to this group.
+        """
+        ret: BaseVar = self
+        for n in path.split("."):
+            child = None
+            if isinstance(ret, VarGroup) and n in ret._schema:
+                child = ret.__dict__.get(n)
+            if not isinstance(child, BaseVar):
+                raise UndefinedVarError(parent_fullname=ret._fullname, var_name=n)
+            ret = child
 
         return ret
 
-    def _validate(self) -> None:
-        errors = self._errors
+    def _get_var(self, path: str) -> FinalVar:
+        var = self._get_node(path)
+        if not isinstance(var, FinalVar):
+            raise UndefinedVarError(parent_fullname=self._fullname, var_name=path)
+
+        return var
+
+    def subscribe(
+        self, callback: Callable[[Changes], Any], *paths: str
+    ) -> Callable[[], None]:
+        """
+        Call callback with changes of vars of this group, or only of given vars and groups.
+
+        Changes are {full name: (old value, new value)}, computed vars are included when
+        their value changes. Changes made inside batch() are reported once.
+
+        Computed vars that aren't memoized are re-evaluated when vars they read change.
+        Vars whose value can't be evaluated are skipped until it can be again.
+
+        :param paths: Dotted paths of vars or groups relative to this group, e.g. "db.port"
+        :return: Function cancelling the subscription
+        """
+        root = cast(VarGroup, self._root)
+        if root._observers is None:
+            root.__dict__["_observers"] = Observers()
+
+        nodes = [self._get_node(p) for p in paths] if paths else [self]
+        vars: List[FinalVar] = []
+        for n in nodes:
+            if isinstance(n, VarGroup):
+                vars.extend(n._flat)
+            else:
+                vars.append(cast(FinalVar, n))
+
+        volatile = {
+            v
+            for v in vars
+            if isinstance(v, ComputedMixin)
+            and v._fget
+            and not v._cache
+            and not v._async_get
+        }
+        return cast(Observers, root._observers).subscribe(callback, vars, volatile)
+
+    def batch(self) -> ContextManager[None]:
+        """
+        Context manager coalescing changes made inside it into one notification per subscriber.
+        """
+        return self._batch()
+
+    @contextmanager
+    def _batch(self) -> Iterator[None]:
+        observers = self._root._observers if self._root else None
+        if observers is None:
+            yield
+            return
+
+        observers.begin()
+        try:
+            yield
+        finally:
+            observers.end()
+
+    @contextmanager
+    def _override(self, values: Dict[str, Any]) -> Iterator["VarGroup"]:
+        """
+        Override values of vars, given by dotted paths, for the current task or thread.
+
+        Overrides of outer scopes are kept, changes of vars are still made to the shared values.
+        """
+        overlay = dict(_overrides.get() or {})
+        errors: List[EnviumError] = []
+        for path, value in values.items():
+            var = cast(Var, self._get_var(path))
+            errors.extend(var._check_value(value))
+            overlay[var] = value
+
+        if errors:
+            raise ValidationErrors(errors)
+
+        scope = object()
+        token = _overrides.set(overlay)
+        _override_scopes.append(scope)
+        try:
+            yield self
+        finally:
+            _override_scopes.remove(scope)
+            _overrides.reset(token)
+
+    @property
+    def published(self) -> Any:
+        """
+        Frozen snapshot published by the last atomic update, reading it never blocks.
+
+        While an atomic block is open in another thread the snapshot from before the block
+        is returned. Changes made outside atomic blocks are published on the next read.
+        """
+        return self._get_published()
+
+    def _get_published(self) -> FrozenGroup:
+        root = cast(VarGroup, self._root)
+        published = self._published
+        version = root._version
+        if published is not None and published[0] == version:
+            return published[1]
+
+        block = root._atomic_block
+        if block is not None:
+            # Changes of an unfinished block of this thread must not be published
+            if block.thread_id == threading.get_ident():
+                with _shared_values():
+                    return self._freeze(self._validate())
+            if published is not None:
+                return published[1]
+
+        # Rebuilt without locking, it's stored only if no writer interfered meanwhile
+        with _shared_values():
+            snapshot = self._freeze(self._validate())
+        if block is None and root._atomic_block is None and root._version == version:
+            self.__dict__["_published"] = (version, snapshot)
+            return snapshot
+
+        published = self._published
+        if published is not None:
+            return published[1]
+        if block is None and root._atomic_block is None:
+            # Only changes made outside atomic blocks interfered
+            return snapshot
+
+        # Never published and a block is open, wait for it to get consistent values
+        with _get_write_lock(root):
+            return self._get_published()
+
+    def _refresh_published(self) -> None:
+        """
+        Rebuild published snapshot if it's stale, called by writers holding the write lock.
+        """
+        root = cast(VarGroup, self._root)
+        published = self._published
+        if published is not None and published[0] == root._version:
+            return
+
+        version = root._version
+        try:
+            with _shared_values():
+                snapshot = self._freeze(self._validate())
+        except ValidationErrors:
+            # Invalid values aren't published, readers keep the previous snapshot
+            return
+        self.__dict__["_published"] = (version, snapshot)
+
+    def _validate(self) -> Dict[VarType, Any]:
+        errors, values = self._resolve_all()
 
         if errors:
             raise ValidationErrors(errors)
+
+        return values
@@ -34,7 +34,9 @@ def env_sandbox() -> Path:
     environ_before = os.environ.copy()
 
     yield
-    os.environ = environ_before
+    # Restored in place, so os.environ keeps updating the environment of the process
+    os.environ.clear()
+    os.environ.update(environ_before)
 
 
 @fixture
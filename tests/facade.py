@@ -1,4 +1,6 @@
+from envium.cache import *
 from envium.ctx import *
 from envium.environ import *
 from envium.exceptions import *
+from envium.providers import *
 from envium.secrets import *
@@ -1,4 +1,7 @@
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
 from textwrap import dedent
 from typing import List, Optional
@@ -42,6 +45,38 @@ class TestMisc:
         ctx = Context()
         ctx.validate()
 
+    def test_shadowing_annotation_only(self):
+        class BaseContext(Ctx):
+            name: str = ctx_var()
+
+        class Context(BaseContext):
+            name: Optional[str]
+
+        assert Context._schema["name"].optional
+        assert not BaseContext._schema["name"].optional
+
+        ctx = Context()
+        assert ctx.name is None
+        ctx.validate()
+
+    def test_inherited(self):
+        class BaseContext(Ctx):
+            flavour: str = ctx_var("matcha")
+
+        class Context(BaseContext):
+            size: int = ctx_var(3)
+
+        ctx1 = Context()
+        ctx2 = Context()
+        ctx1.flavour = "caramel"
+
+        assert ctx1.flavour == "caramel"
+        assert ctx1.size == 3
+        assert ctx2.flavour == "matcha"
+        assert BaseContext().flavour == "matcha"
+
+        ctx1.validate()
+
     def test_copy_from(self):
         class CakeCtx(Ctx):
             flavour: str = ctx_var()
@@ -117,6 +152,39 @@ class TestMisc:
         assert cakeshop1_ctx.cake.flavour.name == "Caramel"
         assert cakeshop2_ctx.cake.flavour.name == "Matcha"
 
+    def test_mutable_default_not_shared(self):
+        class Context(Ctx):
+            cakes: List[str] = ctx_var(default=["Crepe"])
+            name: str = ctx_var("Cakeshop")
+
+        ctx1 = Context()
+        ctx2 = Context()
+        ctx1.cakes.append("Muffin")
+
+        assert ctx1.cakes == ["Crepe", "Muffin"]
+        assert ctx2.cakes == ["Crepe"]
+        assert ctx1.name is ctx2.name
+
+        ctx1.validate()
+
+    def test_group_attributes_not_shared(self):
+        class Context(Ctx):
+            class Group(CtxGroup):
+                name: str = ctx_var("Cake")
+
+                def __init__(self) -> None:
+                    super().__init__()
+                    self.tags = ["a"]
+
+            group = Group()
+
+        ctx1 = Context()
+        ctx2 = Context()
+        ctx1.group.tags.append("b")
+
+        assert ctx1.group.tags == ["a", "b"]
+        assert ctx2.group.tags == ["a"]
+
     def test_no_name(self):
         class Context(Ctx):
             test_var: str = ctx_var("Cake")
@@ -255,6 +323,56 @@ class TestComputed:
         assert ctx.test_var == "computedcomputed"
         ctx.validate()
 
+    def test_cache(self):
+        calls = []
+
+        class Context(Ctx):
+            class Python(CtxGroup):
+                version: str = ctx_var("3.8")
+
+            def fget(self) -> str:
+                calls.append(1)
+                return f"{self.name}-{self.python.version}"
+
+            name: str = ctx_var("python")
+            other: str = ctx_var("other")
+            python = Python()
+            full_name: str = facade.computed_ctx_var(fget=fget, cache=True)
+
+        ctx = Context(name="ctx")
+        calls.clear()
+
+        assert ctx.full_name == "python-3.8"
+        assert ctx.full_name == "python-3.8"
+        ctx.validate()
+        assert len(calls) == 1
+
+        ctx.other = "changed"
+        assert ctx.full_name == "python-3.8"
+        assert len(calls) == 1
+
+        ctx.python.version = "3.11"
+        assert ctx.full_name == "python-3.11"
+        assert len(calls) == 2
+
+    def test_cache_chained(self):
+        class Context(Ctx):
+            def fget_upper(self) -> str:
+                return self.name.upper()
+
+            def fget_greeting(self) -> str:
+                return f"Hello {self.upper_name}"
+
+            name: str = ctx_var("cake")
+            upper_name: str = facade.computed_ctx_var(fget=fget_upper, cache=True)
+            greeting: str = facade.computed_ctx_var(fget=fget_greeting, cache=True)
+
+        ctx = Context(name="ctx")
+        assert ctx.greeting == "Hello CAKE"
+
+        ctx.name = "muffin"
+        assert ctx.greeting == "Hello MUFFIN"
+
     def test_error(self):
         class Context(Ctx):
             def fget(self) -> float:
@@ -308,3 +426,765 @@ class TestValidation:
         ctx = Context(name="ctx")
         with raises(facade.ValidationErrors):
             ctx.validate()
+
+
+class TestFreezing:
+    def test_basic(self):
+        class Context(Ctx):
+            class Group(CtxGroup):
+                tags: List[str] = ctx_var(default_factory=lambda: ["a", "b"])
+                options: dict = ctx_var(default_factory=lambda: {"a": 1})
+
+            name: str = ctx_var("Cake")
+            greeting: str = computed_ctx_var(fget=lambda ctx: f"Hello {ctx.name}")
+            group = Group()
+
+        ctx = Context()
+        frozen = ctx.freeze()
+
+        assert frozen.name == "Cake"
+        assert frozen.greeting == "Hello Cake"
+        assert frozen.group.tags == ("a", "b")
+        assert frozen.group.options["a"] == 1
+        assert hash(frozen) == hash(ctx.freeze())
+        assert frozen == ctx.freeze()
+
+        ctx.name = "Muffin"
+        assert frozen.greeting == "Hello Cake"
+        assert ctx.freeze() != frozen
+
+        with raises(facade.FrozenError):
+            frozen.name = "Muffin"
+
+        with raises(AttributeError):
+            frozen.other = 1
+
+    def test_member_names(self):
+        class Context(Ctx):
+            _values: str = ctx_var("Cake")
+            _fields: int = ctx_var(1)
+
+        ctx = Context()
+        frozen = ctx.freeze()
+
+        assert (frozen._values, frozen._fields) == ("Cake", 1)
+        assert frozen == ctx.freeze()
+        assert hash(frozen) == hash(ctx.freeze())
+
+        ctx._fields = 2
+        assert frozen != ctx.freeze()
+
+    def test_copy(self):
+        import copy
+
+        class Context(Ctx):
+            tags: List[str] = ctx_var(default_factory=lambda: ["a", "b"])
+
+        frozen = Context().freeze()
+
+        assert copy.copy(frozen) is frozen
+        assert copy.deepcopy(frozen) is frozen
+        assert copy.deepcopy({"frozen": frozen})["frozen"] is frozen
+
+    def test_validates(self):
+        class Context(Ctx):
+            name: str = ctx_var()
+
+        with raises(facade.ValidationErrors):
+            Context().freeze()
+
+
+class TestConcurrency:
+    def test_computed_read_from_many_threads(self):
+        class Context(Ctx):
+            def fget(self) -> str:
+                time.sleep(0.0001)
+                return self.name.upper()
+
+            name: str = ctx_var("cake")
+            upper_name: str = computed_ctx_var(fget=fget)
+
+        ctx = Context()
+        results = []
+
+        def read() -> None:
+            results.extend(ctx.upper_name for i in range(50))
+
+        threads = [threading.Thread(target=read) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["CAKE"] * 16 * 50
+
+    def test_atomic(self):
+        class Context(Ctx):
+            class Range(CtxGroup):
+                low: int = ctx_var(0)
+                high: int = ctx_var(1)
+
+            range = Range()
+            name: str = ctx_var("cake")
+            span: int = computed_ctx_var(
+                fget=lambda ctx: ctx.range.high - ctx.range.low
+            )
+
+        ctx = Context()
+        stop = threading.Event()
+        seen = []
+
+        def read() -> None:
+            while not stop.is_set():
+                published = ctx.published
+                if published.range.high - published.range.low != published.span:
+                    seen.append(published)
+                if published.span != 1:
+                    seen.append(published)
+                time.sleep(0)
+
+        readers = [threading.Thread(target=read) for i in range(16)]
+        for t in readers:
+            t.start()
+
+        def write(offset: int) -> None:
+            for i in range(50):
+                with ctx.atomic():
+                    ctx.range.low = offset + i
+                    time.sleep(0)
+                    ctx.range.high = offset + i + 1
+
+        writers = [threading.Thread(target=write, args=(i * 1000,)) for i in range(2)]
+        for t in writers:
+            t.start()
+        for t in writers:
+            t.join()
+
+        stop.set()
+        for t in readers:
+            t.join()
+
+        assert seen == []
+        assert ctx.published.span == 1
+
+    def test_deepcopy(self):
+        import copy
+
+        class Context(Ctx):
+            name: str = ctx_var("cake")
+
+        ctx = Context()
+        with ctx.atomic():
+            ctx.name = "muffin"
+
+        ctx_copy = copy.deepcopy(ctx)
+        assert ctx_copy.name == "muffin"
+
+        ctx_copy.name = "bread"
+        assert ctx.name == "muffin"
+
+    def test_atomic_invalid(self):
+        class Context(Ctx):
+            name: str = ctx_var("cake")
+            count: int = ctx_var(1)
+
+        ctx = Context()
+        published = ctx.published
+
+        with raises(facade.ValidationErrors):
+            with ctx.atomic():
+                ctx.name = "muffin"
+                ctx.count = "many"
+
+        assert ctx.name == "cake"
+        assert ctx.count == 1
+        assert ctx.published is published
+
+    def test_published_after_write(self):
+        class Context(Ctx):
+            class Group(CtxGroup):
+                count: int = ctx_var(1)
+
+            name: str = ctx_var("cake")
+            group = Group()
+
+        ctx = Context()
+        published = ctx.published
+        assert ctx.published is published
+
+        ctx.name = "muffin"
+        assert ctx.published.name == "muffin"
+
+        ctx.group.count = 2
+        assert ctx.published.group.count == 2
+        assert ctx.group.published.count == 2
+
+    def test_atomic_keeps_concurrent_writes(self):
+        class Context(Ctx):
+            name: str = ctx_var("cake")
+            count: int = ctx_var(1)
+
+        ctx = Context()
+
+        def write() -> None:
+            ctx.count = 2
+
+        with raises(RuntimeError):
+            with ctx.atomic():
+                ctx.name = "muffin"
+                # Same value as the concurrent write is still told apart from it
+                ctx.count = 2
+                writer = threading.Thread(target=write)
+                writer.start()
+                writer.join()
+                raise RuntimeError()
+
+        assert ctx.name == "cake"
+        assert ctx.count == 2
+        assert ctx.published.count == 2
+
+    def test_published_never_blocks(self):
+        class Context(Ctx):
+            name: str = ctx_var("cake")
+
+        ctx = Context()
+        ctx.name = "muffin"
+
+        entered = threading.Event()
+        done = threading.Event()
+
+        def write() -> None:
+            with ctx.atomic():
+                ctx.name = "bread"
+                entered.set()
+                done.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        entered.wait(5)
+
+        results = []
+        reader = threading.Thread(target=lambda: results.append(ctx.published.name))
+        reader.start()
+        reader.join(5)
+        blocked = reader.is_alive()
+
+        done.set()
+        writer.join()
+        reader.join()
+
+        assert not blocked
+        assert results == ["muffin"]
+        assert ctx.published.name == "bread"
+
+
+class TestAsync:
+    def test_aresolve(self):
+        calls: List[str] = []
+        in_flight: List[str] = []
+        max_in_flight = 0
+
+        async def fetch(value: str) -> str:
+            nonlocal max_in_flight
+            calls.append(value)
+            in_flight.append(value)
+            max_in_flight = max(max_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(value)
+            return value
+
+        class Context(Ctx):
+            async def fget_host(self) -> str:
+                return await fetch("localhost")
+
+            async def fget_port(self) -> str:
+                return await fetch("8080")
+
+            async def fget_address(self) -> str:
+                await fetch("address")
+                return f"{await self.aget('host')}:{await self.aget('port')}"
+
+            def fget_url(self) -> str:
+                return f"http://{self.address}"
+
+            address: str = computed_ctx_var(fget=fget_address)
+            host: str = computed_ctx_var(fget=fget_host)
+            port: str = computed_ctx_var(fget=fget_port)
+            url: str = computed_ctx_var(fget=fget_url, cache=True)
+
+        async def main() -> Context:
+            ctx = Context()
+            with raises(facade.UnresolvedVarError):
+                ctx.host
+
+            await ctx.aresolve()
+            return ctx
+
+        ctx = asyncio.run(main())
+
+        # Fgets ran concurrently and address waited for its dependencies without rerunning
+        assert sorted(calls) == ["8080", "address", "localhost"]
+        assert max_in_flight == 3
+
+        assert ctx.host == "localhost"
+        assert ctx.address == "localhost:8080"
+        assert ctx.url == "http://localhost:8080"
+        ctx.validate()
+
+    def test_aresolve_plain_read(self):
+        calls: List[str] = []
+
+        class Context(Ctx):
+            async def fget_host(self) -> str:
+                calls.append("host")
+                await asyncio.sleep(0)
+                return "localhost"
+
+            async def fget_address(self) -> str:
+                calls.append("address")
+                return f"{self.host}:8080"
+
+            address: str = computed_ctx_var(fget=fget_address)
+            host: str = computed_ctx_var(fget=fget_host)
+
+        ctx = Context()
+        asyncio.run(ctx.aresolve())
+
+        # Plain reads of unresolved async vars restart fget once the var resolves
+        assert calls == ["address", "host", "address"]
+        assert ctx.address == "localhost:8080"
+
+    def test_sync_access(self):
+        class Context(Ctx):
+            async def fget(self) -> str:
+                return "cake"
+
+            async def fset(self, value: str) -> None:
+                self.name = value
+
+            name: str = ctx_var("cake")
+            value: str = computed_ctx_var(fget=fget)
+            setter: str = computed_ctx_var(fget=fget, fset=fset)
+
+        ctx = Context()
+        assert ctx.value == "cake"
+
+        ctx.setter = "muffin"
+        assert ctx.name == "muffin"
+
+        async def main() -> None:
+            await ctx.aset("setter", "cookie")
+
+        asyncio.run(main())
+        assert ctx.name == "cookie"
+
+    def test_errors(self):
+        class Context(Ctx):
+            async def fget_first(self) -> str:
+                return self.second
+
+            async def fget_second(self) -> str:
+                return self.first
+
+            async def fget_broken(self) -> str:
+                raise ValueError("broken")
+
+            first: str = computed_ctx_var(fget=fget_first)
+            second: str = computed_ctx_var(fget=fget_second)
+            broken: str = computed_ctx_var(fget=fget_broken)
+
+        ctx = Context(name="ctx")
+        with raises(facade.ValidationErrors) as e:
+            asyncio.run(ctx.aresolve())
+
+        assert [err.var_name for err in e.value.errors] == [
+            "ctx.broken",
+            "ctx.first",
+            "ctx.second",
+        ]
+
+    def test_nested_sync_read(self):
+        class Context(Ctx):
+            async def fget_upper(self) -> str:
+                return self.name.upper()
+
+            async def fget_shout(self) -> str:
+                return f"{self.upper}!"
+
+            name: str = ctx_var("cake")
+            upper: str = computed_ctx_var(fget=fget_upper)
+            shout: str = computed_ctx_var(fget=fget_shout)
+
+        ctx = Context()
+        assert ctx.shout == "CAKE!"
+
+    def test_dependencies(self):
+        for cache in [False, True]:
+            calls: List[str] = []
+
+            class Context(Ctx):
+                async def fget(self) -> str:
+                    calls.append(self.name)
+                    return self.name.upper()
+
+                name: str = ctx_var("cake")
+                upper: str = computed_ctx_var(fget=fget, cache=cache)
+
+            ctx = Context()
+            asyncio.run(ctx.aresolve())
+            assert ctx.upper == "CAKE"
+
+            ctx.name = "muffin"
+            assert ctx.upper == "MUFFIN"
+            assert ctx.upper == "MUFFIN"
+
+            # Memoized values are evaluated once per change, others on every read
+            expected = ["cake", "muffin"] if cache else ["cake", "muffin", "muffin"]
+            assert calls == expected
+
+    def test_cancelled(self):
+        class Context(Ctx):
+            async def fget(self) -> str:
+                raise asyncio.CancelledError()
+
+            value: str = computed_ctx_var(fget=fget)
+
+        ctx = Context()
+        with raises(asyncio.CancelledError):
+            asyncio.run(ctx.aresolve())
+
+
+class TestOverride:
+    def test_basic(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+
+            def fget(self) -> str:
+                return f"{self.user_id}@{self.db.name}"
+
+            user_id: int = ctx_var(0)
+            db = Db()
+            identity: str = computed_ctx_var(fget=fget, cache=True)
+
+        ctx = Context(name="ctx")
+        assert ctx.identity == "0@prod"
+
+        with ctx.override(user_id=1, **{"db.name": "test"}):
+            assert ctx.user_id == 1
+            assert ctx.db.name == "test"
+            assert ctx.identity == "1@test"
+
+            with ctx.override(user_id=2):
+                assert ctx.identity == "2@test"
+                assert ctx.freeze().identity == "2@test"
+
+            assert ctx.user_id == 1
+
+        assert ctx.user_id == 0
+        assert ctx.identity == "0@prod"
+
+    def test_invalid(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+
+            user_id: int = ctx_var(0)
+            db = Db()
+
+        ctx = Context(name="ctx")
+
+        with raises(facade.ValidationErrors):
+            with ctx.override(user_id="1"):
+                pass
+
+        with raises(facade.UndefinedVarError):
+            with ctx.override(**{"db.other": "test"}):
+                pass
+
+    def test_isolation(self):
+        class Context(Ctx):
+            user_id: int = ctx_var(0)
+            identity: str = computed_ctx_var(
+                fget=lambda ctx: f"{ctx.user_id}@prod", cache=True
+            )
+
+        ctx = Context(name="ctx")
+
+        async def handle(user_id: int) -> List[str]:
+            with ctx.override(user_id=user_id):
+                ret = [ctx.identity]
+                await asyncio.sleep(0.01)
+                ret.append(ctx.identity)
+                return ret
+
+        async def main() -> List[List[str]]:
+            return await asyncio.gather(*(handle(i) for i in range(1, 4)))
+
+        assert asyncio.run(main()) == [[f"{i}@prod"] * 2 for i in range(1, 4)]
+
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def run(user_id: int) -> None:
+            with ctx.override(user_id=user_id):
+                barrier.wait()
+                results[user_id] = ctx.user_id
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in (1, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {1: 1, 2: 2}
+        assert ctx.user_id == 0
+
+    def test_not_shared(self):
+        class Context(Ctx):
+            name: str = ctx_var("prod")
+            user_id: int = ctx_var(0)
+            identity: str = computed_ctx_var(
+                fget=lambda ctx: f"{ctx.user_id}@{ctx.name}", cache=True
+            )
+
+        ctx = Context(name="ctx")
+
+        with ctx.override(user_id=1):
+            assert ctx.published.identity == "0@prod"
+
+            with ctx.atomic():
+                ctx.name = "test"
+
+            assert ctx.identity == "1@test"
+            assert ctx.published.identity == "0@test"
+
+        assert ctx.published.identity == "0@test"
+
+
+class TestObservers:
+    def test_subscribe(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+                port: int = ctx_var(5432)
+
+            user: str = ctx_var("admin")
+            db = Db()
+            url: str = computed_ctx_var(
+                fget=lambda ctx: f"{ctx.user}@{ctx.db.name}", cache=True
+            )
+            port_str: str = computed_ctx_var(fget=lambda ctx: str(ctx.db.port))
+
+        ctx = Context(name="ctx")
+        everything = []
+        db = []
+        port = []
+
+        ctx.subscribe(everything.append)
+        ctx.db.subscribe(db.append)
+        unsubscribe = ctx.subscribe(port.append, "db.port")
+
+        ctx.db.name = "test"
+        assert everything == [
+            {"ctx.db.name": ("prod", "test"), "ctx.url": ("admin@prod", "admin@test")}
+        ]
+        assert db == [{"ctx.db.name": ("prod", "test")}]
+        assert port == []
+
+        ctx.db.port = 1000
+        assert port == [{"ctx.db.port": (5432, 1000)}]
+        assert everything[-1] == {
+            "ctx.db.port": (5432, 1000),
+            "ctx.port_str": ("5432", "1000"),
+        }
+
+        unsubscribe()
+        ctx.db.port = 2000
+        assert len(port) == 1
+
+        everything.clear()
+        ctx.user = "admin"
+        assert everything == []
+
+    def test_batch(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+                port: int = ctx_var(5432)
+
+            user: str = ctx_var("admin")
+            db = Db()
+            url: str = computed_ctx_var(
+                fget=lambda ctx: f"{ctx.user}@{ctx.db.name}", cache=True
+            )
+
+        ctx = Context(name="ctx")
+        events = []
+        ctx.subscribe(events.append)
+
+        with ctx.batch():
+            ctx.user = "root"
+            ctx.db.name = "test"
+            ctx.db.port = 1
+            ctx.db.port = 5432
+            assert events == []
+
+        assert events == [
+            {
+                "ctx.db.name": ("prod", "test"),
+                "ctx.url": ("admin@prod", "root@test"),
+                "ctx.user": ("admin", "root"),
+            }
+        ]
+
+    def test_copy_from(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+                port: int = ctx_var(5432)
+
+            user: str = ctx_var("admin")
+            db = Db()
+
+        ctx = Context(name="ctx")
+        other = Context(name="ctx")
+        other.user = "root"
+        other.db.port = 1
+
+        events = []
+        ctx.subscribe(events.append, "user", "db")
+        ctx.copy_from(other)
+
+        assert events == [{"ctx.db.port": (5432, 1), "ctx.user": ("admin", "root")}]
+
+    def test_volatile(self):
+        calls: List[str] = []
+
+        class Context(Ctx):
+            def fget(self) -> str:
+                calls.append(self.user)
+                return self.user.upper()
+
+            user: str = ctx_var("admin")
+            flavour: str = ctx_var("matcha")
+            upper: str = computed_ctx_var(fget=fget)
+
+        ctx = Context(name="ctx")
+        events = []
+        ctx.subscribe(events.append, "upper")
+        calls.clear()
+
+        # Computed vars that aren't memoized are re-evaluated only when vars they read change
+        ctx.flavour = "caramel"
+        assert calls == []
+
+        ctx.user = "root"
+        assert calls == ["root"]
+        assert events == [{"ctx.upper": ("ADMIN", "ROOT")}]
+
+    def test_unknown(self):
+        class Context(Ctx):
+            def fget(self) -> int:
+                return 10 // self.divisor
+
+            divisor: int = ctx_var(1)
+            ratio: int = computed_ctx_var(fget=fget)
+
+        ctx = Context(name="ctx")
+        ctx.divisor = 0
+        events = []
+        ctx.subscribe(events.append, "ratio")
+
+        # Values that can't be evaluated are never reported
+        ctx.divisor = 2
+        assert events == []
+
+        ctx.divisor = 0
+        assert events == []
+
+        ctx.divisor = 5
+        assert events == [{"ctx.ratio": (5, 2)}]
+
+    def test_overrides(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+
+            def fget(self) -> str:
+                return f"{self.user_id}@{self.db.name}"
+
+            user_id: int = ctx_var(0)
+            db = Db()
+            identity: str = computed_ctx_var(fget=fget, cache=True)
+
+        ctx = Context(name="ctx")
+        events = []
+        ctx.subscribe(events.append, "identity")
+
+        # Notifications are shared by all tasks, so they don't see overrides
+        with ctx.override(user_id=1):
+            ctx.db.name = "test"
+            assert ctx.identity == "1@test"
+
+        assert events == [{"ctx.identity": ("0@prod", "0@test")}]
+
+    def test_threads(self):
+        class Context(Ctx):
+            class Db(CtxGroup):
+                name: str = ctx_var("prod")
+
+            user: str = ctx_var("admin")
+            db = Db()
+
+        ctx = Context(name="ctx")
+        events = []
+        ctx.subscribe(events.append, "user", "db.name")
+
+        started = threading.Event()
+        done = threading.Event()
+
+        def write_in_batch() -> None:
+            with ctx.batch():
+                ctx.user = "root"
+                started.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=write_in_batch)
+        thread.start()
+        started.wait(5)
+
+        # Batch of the other thread doesn't hold back this notification
+        ctx.db.name = "test"
+        assert events == [{"ctx.db.name": ("prod", "test")}]
+
+        done.set()
+        thread.join()
+        assert events[-1] == {"ctx.user": ("admin", "root")}
+
+    def test_concurrent_writes(self):
+        class Context(Ctx):
+            port: int = ctx_var(5432)
+
+        ctx = Context(name="ctx")
+        events = []
+        ctx.subscribe(events.append, "port")
+
+        def write(start: int) -> None:
+            for i in range(start, start + 200):
+                ctx.port = i
+
+        threads = [threading.Thread(target=write, args=(i * 1000,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Notifications chain from the initial to the final value without gaps,
+        # though callbacks of different threads may be called in any order
+        changes = dict(e["ctx.port"] for e in events)
+        assert len(changes) == len(events)
+        value = 5432
+        for _ in events:
+            value = changes[value]
+        assert value == ctx.port
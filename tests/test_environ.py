@@ -1,12 +1,17 @@
+import io
+import json
 import os
+import subprocess
+import sys
+from enum import Enum
 from pathlib import Path
 from textwrap import dedent
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
-from pytest import raises
+from pytest import importorskip, raises
 
 from tests import facade, utils
-from tests.facade import EnvGroup, Environ, env_var
+from tests.facade import EnvGroup, Environ, computed_env_var, env_var
 
 
 class TestMisc:
@@ -21,6 +26,24 @@ class TestMisc:
         assert env.test_var == "Cake"
         assert env.get_env_vars() == {"ENV_TESTVAR": "Cake"}
 
+    def test_mixin(self, env_sandbox):
+        class Mixin:
+            x: int = env_var(1)
+
+        class Env(Mixin, Environ):
+            y: int = env_var(2)
+
+        os.environ["ENV_X"] = "5"
+        env = Env(name="env", load=True)
+
+        assert env.x == 5
+        assert env.y == 2
+        assert env.get_env_vars() == {"ENV_X": "5", "ENV_Y": "2"}
+
+        env.x = 3
+        assert env.x == 3
+        assert Env(name="env").x == 1
+
     def test_no_name(self):
         class Env(Environ):
             test_var: str = env_var()
@@ -226,6 +249,43 @@ class TestMisc:
             "VERSION_MINOR": "3",
         }
 
+    def test_replace_group(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            test_var: str = env_var("Cake")
+            python = Python()
+
+        env = Env(name="env")
+        assert env.get_env_vars() == {
+            "ENV_PYTHON_VERSION": "3.8",
+            "ENV_TESTVAR": "Cake",
+        }
+
+        class Python(EnvGroup):
+            name: str = env_var("python")
+
+        env.python = Python()
+        assert env.python.name == "python"
+        assert env.get_env_vars() == {
+            "ENV_PYTHON_NAME": "python",
+            "ENV_TESTVAR": "Cake",
+        }
+
+    def test_names_bound_once(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            python = Python(raw=True)
+
+        env = Env(name="env")
+        var = env.env_index["PYTHON_VERSION"]
+
+        assert var._fullname == "python.version"
+        assert var._get_env_name() is var._get_env_name()
+
     def test_path(self):
         class Env(Environ):
             test_var: Path = env_var(Path("my_path/child"))
@@ -303,6 +363,22 @@ class TestComputed:
         assert env.test_var == "computed"
         assert env.get_env_vars() == {"ENV_TESTVAR": "computed"}
 
+    def test_evaluated_once_on_export(self):
+        calls = []
+
+        class Env(Environ):
+            def fget(self) -> str:
+                calls.append(1)
+                return "computed"
+
+            test_var: str = facade.computed_env_var(fget=fget)
+
+        env = Env(name="env")
+        calls.clear()
+
+        assert env.get_env_vars() == {"ENV_TESTVAR": "computed"}
+        assert len(calls) == 1
+
     def test_fset(self):
         class Env(Environ):
             def fset(self, value) -> None:
@@ -362,6 +438,49 @@ class TestLoading:
             "TEST_VAR": "From environ",
         }
 
+    def test_nested_without_root_load(self, sandbox, env_sandbox):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            name: str = env_var("cake")
+            python = Python()
+
+        os.environ["ENV_NAME"] = "muffin"
+        os.environ["ENV_PYTHON_VERSION"] = "3.11"
+        env = Env(name="env")
+
+        assert env.name == "cake"
+        assert env.python.version == "3.11"
+
+    def test_group_opt_out(self, sandbox, env_sandbox):
+        class Env(Environ):
+            class Python(EnvGroup):
+                class Version(EnvGroup):
+                    minor: str = env_var("6")
+
+                version = Version()
+                name: str = env_var("Python")
+
+            python = Python(load=False)
+
+        os.environ["ENV_PYTHON_NAME"] = "CPython"
+        os.environ["ENV_PYTHON_VERSION_MINOR"] = "8"
+        env = Env(name="env", load=True)
+
+        # Nested groups decide on their own
+        assert env.python.name == "Python"
+        assert env.python.version.minor == "8"
+
+    def test_var_named_load(self, sandbox, env_sandbox):
+        class Env(Environ):
+            load: bool = env_var(False)
+
+        os.environ["ENV_LOAD"] = "True"
+        env = Env(name="env", load=True)
+
+        assert env.load is True
+
     def test_path(self, sandbox, env_sandbox):
         class Env(Environ):
             test_var: Path = env_var()
@@ -416,6 +535,341 @@ class TestLoading:
 
         assert env.test_var == ["first", "second"]
 
+    def test_typed(self, env_sandbox):
+        class Color(Enum):
+            RED = "red"
+            GREEN = "green"
+
+        class Env(Environ):
+            port: int = env_var()
+            ratio: float = env_var()
+            color: Color = env_var()
+            ports: List[int] = env_var()
+            paths: List[Path] = env_var()
+            point: Tuple[int, str] = env_var()
+            labels: Dict[str, str] = env_var()
+            mode: Literal["dev", "prod"] = env_var()
+
+        os.environ.update(
+            {
+                "ENV_PORT": "80",
+                "ENV_RATIO": "0.5",
+                "ENV_COLOR": "GREEN",
+                "ENV_PORTS": "80:443",
+                "ENV_PATHS": "/home:/tmp",
+                "ENV_POINT": "1:x",
+                "ENV_LABELS": "app=cake,tier=web",
+                "ENV_MODE": "prod",
+            }
+        )
+
+        env = Env(name="env", load=True)
+        assert env.port == 80
+        assert env.ratio == 0.5
+        assert env.color is Color.GREEN
+        assert env.ports == [80, 443]
+        assert env.paths == [Path("/home"), Path("/tmp")]
+        assert env.point == (1, "x")
+        assert env.labels == {"app": "cake", "tier": "web"}
+        assert env.mode == "prod"
+
+        assert env.get_env_vars() == {
+            "ENV_COLOR": "GREEN",
+            "ENV_LABELS": "app=cake,tier=web",
+            "ENV_MODE": "prod",
+            "ENV_PATHS": "/home:/tmp",
+            "ENV_POINT": "1:x",
+            "ENV_PORT": "80",
+            "ENV_PORTS": "80:443",
+            "ENV_RATIO": "0.5",
+        }
+
+    def test_source(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+                name: str = env_var("python")
+
+            test_var: str = env_var(raw=True)
+            python = Python()
+
+        source = {
+            "TEST_VAR": "From source",
+            "ENV_PYTHON_VERSION": "3.11",
+            "ENV_PYTHON_VERSIONS": "3.11",
+            "HOME": "/home/cake",
+        }
+        env = Env(name="env", source=source)
+
+        assert env.test_var == "From source"
+        assert env.python.version == "3.11"
+        assert env.python.name == "python"
+        assert env.load_report == facade.LoadReport(
+            loaded=["ENV_PYTHON_VERSION", "TEST_VAR"],
+            missing=["ENV_PYTHON_NAME"],
+            unknown=["ENV_PYTHON_VERSIONS"],
+        )
+
+    def test_reload_from_source(self):
+        class Env(Environ):
+            test_var: int = env_var(1)
+
+        env = Env(name="env")
+        assert env.load_report is None
+
+        env.load({"ENV_TESTVAR": "2"})
+        assert env.test_var == 2
+
+    def test_lazy(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            port: int = env_var()
+            python = Python()
+
+        env = Env(name="env", load=True, lazy=True, source={"ENV_PORT": "80"})
+
+        port_var = env.env_index["ENV_PORT"]
+        assert port_var._value != 80
+
+        assert env.port == 80
+        assert port_var._value == 80
+        assert env.python.version == "3.8"
+        env.validate()
+
+    def test_lazy_validate(self):
+        class Env(Environ):
+            port: int = env_var()
+
+        env = Env(name="env", load=True, lazy=True, source={"ENV_PORT": "80"})
+        env.validate()
+
+        env = Env(name="env", load=True, lazy=True, source={})
+        with raises(facade.ValidationErrors):
+            env.validate()
+
+    def test_lazy_read_is_not_change(self):
+        class Env(Environ):
+            port: int = env_var()
+
+        env = Env(name="env", load=True, lazy=True, source={"ENV_PORT": "80"})
+
+        # First read parses the value while the snapshot is built, it stays current
+        published = env.published
+        assert published.port == 80
+        assert env.published is published
+
+    def test_reload(self):
+        class Env(Environ):
+            def fget(self) -> str:
+                return f"localhost:{self.port}"
+
+            port: int = env_var()
+            debug: bool = env_var(False)
+            address: str = facade.computed_env_var(fget=fget, cache=True)
+
+        env = Env(name="env", source={"ENV_PORT": "80", "ENV_DEBUG": "true"})
+        assert env.address == "localhost:80"
+
+        changes = env.reload({"ENV_PORT": "8080", "ENV_DEBUG": "true"})
+        assert changes == {"ENV_PORT": (80, 8080)}
+        assert env.address == "localhost:8080"
+
+        assert env.reload({"ENV_PORT": "8080", "ENV_DEBUG": "true"}) == {}
+
+        with raises(facade.ValidationErrors):
+            env.reload({"ENV_DEBUG": "false"})
+
+        assert env.port == 8080
+        assert env.debug is True
+
+    def test_reload_unparseable(self):
+        class Env(Environ):
+            a: int = env_var()
+            b: int = env_var()
+
+        env = Env(name="app", source={"APP_A": "1", "APP_B": "2"})
+
+        with raises(facade.ValidationErrors) as e:
+            env.reload({"APP_A": "5", "APP_B": "oops"})
+
+        assert [type(err) for err in e.value.errors] == [facade.ParseError]
+        assert env.a == 1
+        assert env.b == 2
+        assert env.get_env_vars() == {"APP_A": "1", "APP_B": "2"}
+
+    def test_load_file(self, sandbox):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            test_var: str = env_var()
+            port: int = env_var(80)
+            python = Python()
+
+        multiline = dedent(
+            """
+        first line
+        "second" line
+        """
+        )
+
+        env = Env(name="env")
+        env.test_var = multiline
+        env.port = 8080
+        env.python.version = "3.11"
+        env.dump("envs/.env")
+
+        Path("envs/.env").write_text(
+            Path("envs/.env").read_text() + '\n# comment\nexport OTHER="value"\n'
+        )
+
+        loaded = Env(name="env")
+        report = loaded.load_file("envs/.env")
+        loaded.validate()
+
+        assert loaded.test_var == multiline
+        assert loaded.port == 8080
+        assert loaded.python.version == "3.11"
+        assert report.unknown == ["OTHER"]
+        assert report.missing == []
+
+    def test_snapshot(self, sandbox, monkeypatch):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            port: int = env_var(80)
+            paths: List[Path] = env_var(default_factory=list)
+            python = Python()
+
+        source = {"ENV_PORT": "8080", "ENV_PATHS": "/a:/b", "ENV_OTHER": "1"}
+        snapshot = Path("cache/env.snapshot")
+
+        env = Env(name="env", source=source, snapshot=snapshot)
+        assert snapshot.stat().st_mode & 0o777 == 0o600
+        assert json.loads(snapshot.read_text())["values"] == {
+            "env.port": ["8080", 8080],
+            "env.paths": ["/a:/b"],
+        }
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Should be restored from snapshot")
+
+        monkeypatch.setattr(facade.Environ, "_validate", fail)
+
+        restored = Env(name="env", source=source, snapshot=snapshot)
+        assert restored.port == 8080
+        assert restored.paths == [Path("/a"), Path("/b")]
+        assert restored.python.version == "3.8"
+        assert restored.load_report == env.load_report
+        assert restored.load_report.unknown == ["ENV_OTHER"]
+
+        monkeypatch.undo()
+
+        changed = Env(name="env", source={"ENV_PORT": "9000"}, snapshot=snapshot)
+        assert changed.port == 9000
+        assert changed.paths == []
+
+        with raises(facade.EnviumError):
+            Env(name="env", source=source, lazy=True, snapshot=snapshot)
+
+    def test_snapshot_default_without_repr(self, sandbox, monkeypatch):
+        class Token:
+            def __init__(self, value: str) -> None:
+                self.value = value
+
+            def __str__(self) -> str:
+                return self.value
+
+        def get_env_class() -> type:
+            class Env(Environ):
+                token: Token = env_var(default_factory=lambda: Token("Cake"))
+
+            return Env
+
+        snapshot = Path("env.snapshot")
+        get_env_class()(name="env", source={}, snapshot=snapshot)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Should be restored from snapshot")
+
+        monkeypatch.setattr(facade.Environ, "_validate", fail)
+
+        # Class created again has a new default object, like in a new process
+        env = get_env_class()(name="env", source={}, snapshot=snapshot)
+        assert str(env.token) == "Cake"
+
+    def test_save_delta(self, env_sandbox, mocker):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            port: int = env_var(80)
+            url: Optional[str] = env_var("localhost")
+            python = Python()
+            address: str = computed_env_var(fget=lambda env: f"{env.url}:{env.port}")
+
+        setitem = mocker.spy(type(os.environ), "__setitem__")
+        written = lambda: [c.args[1] for c in setitem.call_args_list]
+        env = Env(name="env")
+
+        env.save_to_os_environ(delta=True)
+        assert sorted(written()) == [
+            "ENV_ADDRESS",
+            "ENV_PORT",
+            "ENV_PYTHON_VERSION",
+            "ENV_URL",
+        ]
+
+        setitem.reset_mock()
+        env.port = 8080
+        env.python.version = "3.8"
+        env.save_to_os_environ(delta=True)
+        assert written() == ["ENV_ADDRESS", "ENV_PORT"]
+        assert os.environ["ENV_ADDRESS"] == "localhost:8080"
+
+        # Child processes inherit the environment written through os.environ
+        script = "import os; print(os.environ['ENV_ADDRESS'])"
+        output = subprocess.check_output([sys.executable, "-c", script])
+        assert output.decode().strip() == "localhost:8080"
+
+        setitem.reset_mock()
+        env.url = None
+        env.save_to_os_environ(delta=True)
+        assert "ENV_URL" not in os.environ
+        assert written() == ["ENV_ADDRESS"]
+
+        env.port = "80"
+        with raises(facade.ValidationErrors):
+            env.save_to_os_environ(delta=True)
+        assert os.environ["ENV_PORT"] == "8080"
+
+    def test_reload_notifies(self):
+        class Env(Environ):
+            port: int = env_var(80)
+            debug: bool = env_var(False)
+            name: str = env_var()
+            address: str = computed_env_var(fget=lambda env: f"localhost:{env.port}")
+
+        env = Env(name="env", source={"ENV_NAME": "cake"})
+        events = []
+        env.subscribe(events.append)
+
+        env.reload({"ENV_PORT": "8080", "ENV_DEBUG": "true", "ENV_NAME": "cake"})
+        assert events == [
+            {
+                "env.address": ("localhost:80", "localhost:8080"),
+                "env.debug": (False, True),
+                "env.port": (80, 8080),
+            }
+        ]
+
+        with raises(facade.ValidationErrors):
+            env.reload({"ENV_PORT": "1", "ENV_DEBUG": "false"})
+        assert len(events) == 1
+
 
 class TestDumping:
     def test_basic(self, sandbox):
@@ -447,6 +901,46 @@ class TestDumping:
             ).strip()
         )
 
+    def test_unchanged(self, sandbox):
+        class Env(Environ):
+            test_var: str = env_var(default="Cake")
+
+        env = Env(name="env")
+        env_path = Path("envs/.env")
+
+        assert env.dump(env_path)
+        mtime = env_path.stat().st_mtime_ns
+
+        assert not env.dump(env_path)
+        assert env_path.stat().st_mtime_ns == mtime
+
+        env.test_var = "Muffin"
+        assert env.dump(env_path)
+        assert env_path.read_text() == 'ENV_TESTVAR="Muffin"'
+        assert list(env_path.parent.iterdir()) == [env_path]
+
+    def test_file_mode(self, sandbox):
+        class Env(Environ):
+            test_var: str = env_var(default="Cake")
+
+        env = Env(name="env")
+        env_path = Path("envs/.env")
+
+        umask = os.umask(0o077)
+        try:
+            env.dump(env_path)
+        finally:
+            os.umask(umask)
+        assert env_path.stat().st_mode & 0o777 == 0o600
+
+        # Symlinks are kept and the file they point to is replaced
+        link = Path("link.env")
+        link.symlink_to(env_path)
+        env.test_var = "Muffin"
+        assert env.dump(link)
+        assert link.is_symlink()
+        assert env_path.read_text() == 'ENV_TESTVAR="Muffin"'
+
 
 class TestValidation:
     def test_non_optional_no_value(self):
@@ -481,6 +975,32 @@ class TestValidation:
         with raises(facade.ValidationErrors):
             env.validate()
 
+    def test_redefined(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                name: str = env_var(raw=True, default="Python")
+
+            python = Python()
+            name: str = env_var(raw=True, default="MyEnv")
+
+        env = Env(name="env")
+
+        utils.assert_errors(env.errors, [facade.RedefinedVarError("NAME")])
+
+    def test_env_index(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+
+            python = Python()
+            test_var: str = env_var(raw="MY_VAR", default="Cake")
+
+        env = Env(name="env")
+
+        assert list(env.env_index) == ["ENV_PYTHON_VERSION", "MY_VAR"]
+        assert env.env_index["MY_VAR"]._get_value() == "Cake"
+        assert env.env_index["ENV_PYTHON_VERSION"]._fullname == "env.python.version"
+
     def env_var(self):
         class Env(Environ):
             class Python(EnvGroup):
@@ -494,3 +1014,195 @@ class TestValidation:
         assert env.name == "MyEnv"
 
         utils.assert_errors(env._errors, [facade.RedefinedVarError("NAME")])
+
+
+class TestExporting:
+    def test_json(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+                paths: List[str] = env_var(default_factory=lambda: ["/a", "/b"])
+
+            debug: bool = env_var(True)
+            port: int = env_var(80)
+            secret: str = env_var('it\'s "$HOME"\nsecond')
+            url: Optional[str] = env_var()
+            python = Python()
+
+        env = Env(name="env")
+        f = io.StringIO()
+        env.export(f, "json")
+
+        assert json.loads(f.getvalue()) == {
+            "ENV_DEBUG": True,
+            "ENV_PORT": 80,
+            "ENV_PYTHON_PATHS": ["/a", "/b"],
+            "ENV_PYTHON_VERSION": "3.8",
+            "ENV_SECRET": 'it\'s "$HOME"\nsecond',
+            "ENV_URL": None,
+        }
+
+    def test_toml(self):
+        toml = importorskip("toml")
+
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+                paths: List[str] = env_var(default_factory=lambda: ["/a", "/b"])
+
+            debug: bool = env_var(True)
+            port: int = env_var(80)
+            secret: str = env_var('it\'s "$HOME"\nsecond')
+            url: Optional[str] = env_var()
+            python = Python()
+
+        env = Env(name="env")
+        f = io.StringIO()
+        env.export(f, "toml")
+
+        assert toml.loads(f.getvalue()) == {
+            "ENV_DEBUG": True,
+            "ENV_PORT": 80,
+            "ENV_PYTHON_PATHS": ["/a", "/b"],
+            "ENV_PYTHON_VERSION": "3.8",
+            "ENV_SECRET": 'it\'s "$HOME"\nsecond',
+        }
+
+    def test_shell(self):
+        class Env(Environ):
+            secret: str = env_var('it\'s "$HOME"\nsecond')
+
+        env = Env(name="env")
+        f = io.StringIO()
+        env.export(f, "shell")
+
+        script = f.getvalue() + 'printf "%s" "$ENV_SECRET"'
+        result = subprocess.run(
+            ["sh", "-c", script], capture_output=True, text=True, check=True
+        )
+        assert result.stdout == env.secret
+
+    def test_systemd(self):
+        class Env(Environ):
+            class Python(EnvGroup):
+                version: str = env_var("3.8")
+                paths: List[str] = env_var(default_factory=lambda: ["/a", "/b"])
+
+            debug: bool = env_var(True)
+            port: int = env_var(80)
+            secret: str = env_var('it\'s "$HOME"\nsecond')
+            url: Optional[str] = env_var()
+            python = Python()
+
+        env = Env(name="env")
+        f = io.StringIO()
+        env.export(f, "systemd")
+
+        assert f.getvalue().splitlines()[:3] == [
+            'ENV_DEBUG="True"',
+            'ENV_PORT="80"',
+            'ENV_PYTHON_PATHS="/a:/b"',
+        ]
+        assert 'ENV_SECRET="it\'s \\"\\$HOME\\"\nsecond"\n' in f.getvalue()
+
+    def test_unknown_format(self):
+        class Env(Environ):
+            port: int = env_var(80)
+
+        env = Env(name="env")
+
+        with raises(facade.EnviumError):
+            env.export(io.StringIO(), "xml")
+
+
+class TestLayers:
+    def test_basic(self):
+        class Env(Environ):
+            class Db(EnvGroup):
+                name: str = env_var("prod")
+                port: int = env_var(5432)
+
+            stage: str = env_var("local")
+            db = Db()
+            url: str = computed_env_var(
+                fget=lambda env: f"{env.stage}/{env.db.name}:{env.db.port}", cache=True
+            )
+
+        env = Env(name="env")
+
+        ci = env.derive(stage="ci", **{"db.name": "test"})
+        assert ci.stage == "ci"
+        assert ci.db.name == "test"
+        assert ci.db.port == 5432
+        assert ci.url == "ci/test:5432"
+        assert env.url == "local/prod:5432"
+
+        nightly = ci.derive(**{"db.port": 6543})
+        assert nightly.url == "ci/test:6543"
+        assert len(nightly._overrides.maps[0]) == 1
+
+        env.db.port = 1000
+        assert ci.db.port == 1000
+        assert nightly.db.port == 6543
+
+        ci.stage = "ci2"
+        assert ci.stage == "ci2"
+        assert nightly.stage == "ci2"
+        assert env.stage == "local"
+
+    def test_export(self):
+        class Env(Environ):
+            stage: str = env_var("local")
+            port: int = env_var(5432)
+            url: str = computed_env_var(fget=lambda env: f"{env.stage}:{env.port}")
+
+        env = Env(name="env")
+        prod = env.derive(stage="prod")
+
+        assert prod.get_env_vars() == {
+            "ENV_PORT": "5432",
+            "ENV_STAGE": "prod",
+            "ENV_URL": "prod:5432",
+        }
+
+        f = io.StringIO()
+        prod.export(f, "json")
+        assert json.loads(f.getvalue())["ENV_URL"] == "prod:5432"
+
+    def test_validation(self):
+        class Env(Environ):
+            class Db(EnvGroup):
+                port: int = env_var(5432)
+
+            db = Db()
+
+        env = Env(name="env")
+
+        with raises(facade.ValidationErrors):
+            env.derive(**{"db.port": "5432"})
+
+        with raises(facade.UndefinedVarError):
+            env.derive(**{"db.other": 1})
+
+        layer = env.derive()
+        with raises(facade.ValidationErrors):
+            layer.db.port = "5432"
+        assert layer.db.port == 5432
+        assert layer.errors == []
+
+    def test_group_attributes(self):
+        class Env(Environ):
+            scheme = "https"
+            host: str = env_var("localhost")
+            url: str = computed_env_var(
+                fget=lambda env: f"{env.scheme}://{env.host}{env.get_path()}"
+            )
+
+            def get_path(self) -> str:
+                return "/api"
+
+        env = Env(name="env")
+        layer = env.derive(host="example.com")
+
+        assert layer.url == "https://example.com/api"
+        assert env.url == "https://localhost/api"
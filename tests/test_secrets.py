@@ -1,9 +1,14 @@
 import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from textwrap import dedent
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from pytest import raises
+from pytest import importorskip, raises
 
 from tests import facade, utils
 from tests.facade import Secrets, SecretsGroup, computed_secret, secret
@@ -192,3 +197,248 @@ class TestValidation:
         secr = Secr(name="secr")
         with raises(facade.ValidationErrors):
             secr.validate()
+
+
+class TestProviders:
+    def test_directory(self, sandbox):
+        class Secr(Secrets):
+            class Db(SecretsGroup):
+                password: str = secret(provider="files", key="db_password")
+
+            token: str = secret(provider="files")
+            missing: str = secret("default", provider="files")
+            db = Db()
+
+        (sandbox / "token").write_text("SecretToken\n")
+        (sandbox / "db_password").write_text("SecretPassword")
+
+        secr = Secr(providers={"files": facade.DirectoryProvider(sandbox)})
+        assert secr.token == "SecretToken"
+        assert secr.db.password == "SecretPassword"
+        assert secr.missing == "default"
+        secr.validate()
+
+    def test_env_file(self, sandbox):
+        class Secr(Secrets):
+            port: int = secret(
+                provider=facade.EnvFileProvider(sandbox / ".env"), key="PORT"
+            )
+
+        (sandbox / ".env").write_text('PORT="8080"\nOTHER="1"\n')
+
+        secr = Secr()
+        assert secr.port == 8080
+
+    def test_command(self):
+        script = "import sys; print('pass-' + sys.argv[1])"
+        command = [sys.executable, "-c", script, "{key}"]
+
+        class Secr(Secrets):
+            password: str = secret(provider="pass")
+            token: str = secret(provider="pass")
+
+        secr = Secr(providers={"pass": facade.CommandProvider(command)})
+        assert secr.password == "pass-password"
+        assert secr.token == "pass-token"
+
+        failing = facade.CommandProvider([sys.executable, "-c", "exit(1)"])
+        with raises(facade.SecretProviderError):
+            Secr(providers={"pass": failing})
+
+    def test_command_failure_kills_others(self, monkeypatch):
+        processes: List[subprocess.Popen] = []
+        running: List[int] = []
+
+        class Popen(subprocess.Popen):
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                running.append(sum(p.poll() is None for p in processes))
+                super().__init__(*args, **kwargs)
+                processes.append(self)
+
+        monkeypatch.setattr(subprocess, "Popen", Popen)
+
+        script = (
+            "import sys, time; sys.argv[1] == 'bad' and sys.exit(1); time.sleep(30)"
+        )
+        provider = facade.CommandProvider(
+            [sys.executable, "-c", script, "{key}"], max_processes=2
+        )
+
+        start = time.perf_counter()
+        with raises(facade.SecretProviderError):
+            provider.fetch(["bad", "slow", "other"])
+        assert time.perf_counter() - start < 10
+
+        # Third command wasn't started as two were already running
+        assert [p.returncode is not None for p in processes] == [True, True]
+        assert max(running) < 2
+
+    def test_http(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if self.path == "/v1/broken":
+                    # Malformed status line
+                    self.wfile.write(b"BROKEN\r\n\r\n")
+                    self.close_connection = True
+                    return
+
+                if self.path != "/v1/token":
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = b"SecretToken"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        class Secr(Secrets):
+            token: str = secret(provider="vault")
+            missing: Optional[str] = secret(provider="vault")
+
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/v1"
+            secr = Secr(providers={"vault": facade.HttpProvider(url)})
+
+            with raises(facade.SecretProviderError):
+                facade.HttpProvider(url).fetch(["broken"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert secr.token == "SecretToken"
+        assert secr.missing is None
+
+    def test_concurrent(self):
+        # Both batches have to be fetched at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierProvider(facade.SecretProvider):
+            def __init__(self) -> None:
+                self.calls: List[List[str]] = []
+
+            def fetch(self, keys: List[str]) -> Dict[str, str]:
+                self.calls.append(keys)
+                barrier.wait()
+                return {k: k.upper() for k in keys}
+
+        first = BarrierProvider()
+        second = BarrierProvider()
+
+        class Secr(Secrets):
+            a: str = secret(provider="first")
+            b: str = secret(provider="first")
+            c: str = secret(provider="second")
+
+        secr = Secr(providers={"first": first, "second": second})
+
+        assert (secr.a, secr.b, secr.c) == ("A", "B", "C")
+        assert first.calls == [["a", "b"]]
+        assert second.calls == [["c"]]
+
+    def test_unknown_provider(self):
+        class Secr(Secrets):
+            token: str = secret(provider="vault")
+
+        with raises(facade.EnviumError):
+            Secr()
+
+
+class TestCache:
+    class CountingProvider(facade.SecretProvider):
+        def __init__(self) -> None:
+            self.calls = 0
+            self.value = "first"
+
+        def fetch(self, keys: List[str]) -> Dict[str, str]:
+            self.calls += 1
+            return {k: self.value for k in keys}
+
+    def test_basic(self, monkeypatch):
+        class Secr(Secrets):
+            token: str = secret(provider="vault")
+            password: str = secret()
+
+        inputs = ["SecretPassword"]
+        monkeypatch.setattr("envium.secrets.getpass", lambda prompt: inputs.pop())
+
+        provider = self.CountingProvider()
+        cache = facade.SecretCache(ttl=60)
+
+        for i in range(3):
+            secr = Secr(name="secr", providers={"vault": provider}, cache=cache)
+            assert secr.token == "first"
+            assert secr.password == "SecretPassword"
+
+        assert provider.calls == 1
+        assert cache.stats.hits == 4
+        assert cache.stats.misses == 2
+
+    def test_refresh(self):
+        class Secr(Secrets):
+            token: str = secret(provider="vault")
+
+        now = [1000.0]
+        provider = self.CountingProvider()
+        cache = facade.SecretCache(ttl=10, clock=lambda: now[0])
+        Secr(name="secr", providers={"vault": provider}, cache=cache)
+
+        now[0] += 15
+        provider.value = "second"
+        secr = Secr(name="secr", providers={"vault": provider}, cache=cache)
+        assert secr.token == "first"
+
+        deadline = time.time() + 5
+        while cache.stats.refreshes == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert cache.get("secr.token") == "second"
+        assert cache.stats.stale_hits == 1
+
+        now[0] += 25
+        assert cache.get("secr.token", allow_stale=True) is None
+
+    def test_eviction(self):
+        cache = facade.SecretCache(max_size=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.stats.evictions == 1
+
+    def test_encrypted_store(self, sandbox):
+        importorskip("cryptography")
+
+        class Secr(Secrets):
+            token: str = secret(provider="vault")
+
+        key = facade.EncryptedFileStore.generate_key()
+        path = sandbox / "secrets.cache"
+        provider = self.CountingProvider()
+
+        cache = facade.SecretCache(store=facade.EncryptedFileStore(path, key))
+        Secr(name="secr", providers={"vault": provider}, cache=cache)
+        assert b"first" not in path.read_bytes()
+        assert path.stat().st_mode & 0o777 == 0o600
+
+        cache = facade.SecretCache(store=facade.EncryptedFileStore(path, key))
+        secr = Secr(name="secr", providers={"vault": provider}, cache=cache)
+        assert secr.token == "first"
+        assert provider.calls == 1
+
+        other_key = facade.EncryptedFileStore.generate_key()
+        cache = facade.SecretCache(store=facade.EncryptedFileStore(path, other_key))
+        assert cache.get("secr.token") is None